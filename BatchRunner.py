@@ -0,0 +1,289 @@
+import argparse
+import contextlib
+import csv
+import json
+import os
+import random
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+import InstanceFile
+
+# Headless batch runs: every instance is solved in its own worker process under a time limit and
+# reported as one CSV or JSONL row. The time limit bounds each solver's search loop and is checked
+# between steps (one GA generation, one local search pass, one ACO iteration, ...), so the search
+# overshoots by at most one step. Setup before the loop is not budgeted: building the TSP neighbour
+# lists, the subset-sum DP or meet-in-the-middle tables, and so on, so "elapsed" can exceed the
+# limit on large instances.
+#
+#   python -m BatchRunner solve --problem tsp --instances dir/ --workers 32 --time-limit 10s --output runs.csv
+
+PROBLEMS = {'knapsack': InstanceFile.KNAPSACK, 'tsp': InstanceFile.TSP, 'coloring': InstanceFile.COLORING}
+SOLVERS = {
+    'knapsack': ('auto', 'ga', 'exact', 'bnb'),
+    'tsp': ('local', 'anneal', 'aco'),
+    'coloring': ('dsatur', 'tabucol'),
+}
+FIELDS = ['instance', 'problem', 'solver', 'n', 'status', 'objective', 'time_to_best', 'evaluations', 'elapsed',
+          'error']
+
+UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
+
+
+def parse_duration(text):
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*(ms|s|m|h)?\s*', text)
+    if match is None:
+        raise argparse.ArgumentTypeError(f'invalid duration {text!r}, expected e.g. 10s, 500ms or 2m')
+    return float(match.group(1)) * UNITS[match.group(2) or 's']
+
+
+class Tracker:
+    # records when the objective last improved, relative to the start of the run
+    def __init__(self, minimize=True):
+        self.start = time.perf_counter()
+        self.minimize = minimize
+        self.best = None
+        self.time_to_best = None
+
+    def offer(self, objective):
+        if self.best is None or (objective < self.best if self.minimize else objective > self.best):
+            self.best = objective
+            self.time_to_best = time.perf_counter() - self.start
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+
+def solve_knapsack(instance, solver, time_limit, seed):
+    import Knapsack
+
+    values = np.asarray(instance['values'])
+    weighted = 'weights' in instance
+    if solver == 'auto':
+        solver = 'bnb' if weighted else 'ga'
+    if weighted != (solver == 'bnb'):
+        raise ValueError(f'solver {solver} does not match a {"weighted" if weighted else "subset-sum"} instance')
+
+    if solver == 'bnb':
+        tracker = Tracker(minimize=False)
+        knapsack = Knapsack.BranchAndBoundSolver(values, np.asarray(instance['weights']), instance.target)
+        knapsack.subscribe(lambda s: tracker.offer(s.best_value))
+        knapsack.run(time_budget=time_limit)
+        status = 'optimal' if knapsack.solved() else 'stopped'
+        return solver, status, knapsack.best_value, tracker, knapsack.generation
+
+    tracker = Tracker()
+    rng = np.random.default_rng(seed)
+    if solver == 'exact':
+        knapsack = Knapsack.SubsetSumSolver(values, instance.target, rng=rng)
+    else:
+        knapsack = Knapsack.KnapsackSolver(values, instance.target, rng=rng)
+    knapsack.subscribe(lambda s: tracker.offer(s.best()[2]))
+    knapsack.run(max_generations=sys.maxsize, time_budget=time_limit)
+    # fitness is the distance from the target, so 0 is a proven optimum
+    fitness = knapsack.best()[2]
+    tracker.offer(fitness)
+    if fitness == 0:
+        status = 'optimal'
+    elif solver == 'exact' and knapsack.strategy != 'genetic':
+        status = 'infeasible'
+    else:
+        status = 'stopped'
+    if solver == 'exact' and knapsack.strategy != 'genetic':
+        evaluations = None  # solved by DP / meet-in-the-middle, nothing to count in generations
+    else:
+        population = knapsack.fallback.population if solver == 'exact' else knapsack.population
+        generation = knapsack.fallback.generation if solver == 'exact' else knapsack.generation
+        evaluations = population.size * (generation + 1)
+    return solver, status, fitness, tracker, evaluations
+
+
+def solve_tsp(instance, solver, time_limit, seed):
+    import TravelingSalesman
+
+    xs, ys = instance['xs'].tolist(), instance['ys'].tolist()
+    locations = [TravelingSalesman.Location(x, y, i) for i, (x, y) in enumerate(zip(xs, ys))]
+    tracker = Tracker()
+    deadline = tracker.start + time_limit
+    problem = TravelingSalesman.SalesmanProblemSolver(locations)
+    evaluations = 0
+    status = 'done'
+    if problem.num_locations < 2:
+        tracker.offer(problem.best_distance)  # every tour of fewer than two cities has length 0
+    elif solver == 'aco':
+        # the batch already runs one instance per process, so each colony stays in its own worker
+        colony = TravelingSalesman.AntColonySolver(problem, workers=1)
+        tracker.offer(problem.best_distance)
+        while colony.iteration < TravelingSalesman.aco_iterations:
+            if time.perf_counter() >= deadline:
+                status = 'stopped'
+                break
+            colony.iterate()
+            evaluations += colony.num_ants
+            tracker.offer(problem.best_distance)
+        colony.close()
+    elif solver == 'local':
+        tracker.offer(problem.best_distance)
+        while True:
+            if time.perf_counter() >= deadline:
+                status = 'stopped'
+                break
+            improved = problem.local_search_pass()
+            tracker.offer(problem.best_distance)
+            if not improved:
+                break  # a pass without improvement: local optimum
+        evaluations = problem.moves  # improving moves applied, not passes
+    else:
+        tracker.offer(problem.best_distance)
+        while problem.temperature > 1:
+            if time.perf_counter() >= deadline:
+                status = 'stopped'
+                break
+            problem.anneal()
+            evaluations += 1
+            tracker.offer(problem.best_distance)
+    return solver, status, problem.best_distance, tracker, evaluations
+
+
+def solve_coloring(instance, solver, time_limit, seed):
+    import GraphColoring
+
+    graph = GraphColoring.Graph.from_csr(instance.n, instance['indptr'], instance['indices'], instance['edges'])
+    tracker = Tracker()
+    if solver == 'tabucol':
+        coloring = GraphColoring.TabucolSolver(graph, max_iterations=sys.maxsize, time_budget=time_limit,
+                                               rng=np.random.default_rng(seed))
+        colors, k = coloring.solve()
+        tracker.best, tracker.time_to_best = k, coloring.best_time
+        return solver, 'done', k, tracker, coloring.iterations
+    coloring = GraphColoring.DSaturSolver(graph, node_budget=sys.maxsize, time_budget=time_limit)
+    colors, k, optimal = coloring.solve()
+    tracker.offer(k)
+    return solver, 'optimal' if optimal else 'stopped', k, tracker, coloring.nodes
+
+
+SOLVE = {'knapsack': solve_knapsack, 'tsp': solve_tsp, 'coloring': solve_coloring}
+
+
+def run_task(problem, solver, path, time_limit, seed):
+    """Solve one instance in a worker process and return its result row."""
+    # the TSP solvers draw from the global generators
+    random.seed(seed)
+    np.random.seed(seed % 2 ** 32)
+    row = dict.fromkeys(FIELDS)
+    row.update(instance=path, problem=problem, solver=solver)
+    start = time.perf_counter()
+    try:
+        instance = InstanceFile.read(path)
+        row['n'] = instance.n
+        if instance.kind != PROBLEMS[problem]:
+            raise ValueError(f'{path} is a {InstanceFile.KIND_NAMES[instance.kind]} instance, not {problem}')
+        # solvers print progress notes; keep stdout for the result rows
+        with contextlib.redirect_stdout(sys.stderr):
+            solver, status, objective, tracker, evaluations = SOLVE[problem](instance, solver, time_limit, seed)
+        row.update(solver=solver, status=status, objective=objective, evaluations=evaluations,
+                   time_to_best=tracker.time_to_best, elapsed=tracker.elapsed())
+    except Exception as e:
+        row.update(status='error', error=f'{type(e).__name__}: {e}', elapsed=time.perf_counter() - start)
+    return row
+
+
+def stored_kind(path):
+    """Problem kind in a binary instance's header, or None if the file does not start with one."""
+    header = np.fromfile(path, dtype=InstanceFile.HEADER, count=1)
+    if len(header) != 1 or header['magic'][0] != InstanceFile.MAGIC:
+        return None
+    return int(header['kind'][0])
+
+
+def find_instances(paths, problem):
+    """Instance files under the given files and directories that hold this problem.
+
+    Text formats are matched by extension; binary .inst files by the kind in their header."""
+    extensions = [extension for extension, kind in InstanceFile.TEXT_KINDS.items() if kind == PROBLEMS[problem]]
+    extensions.append('.inst')
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                extension, compressed = InstanceFile.file_type(name)
+                if extension not in extensions or (compressed and extension == '.inst'):
+                    continue
+                name = os.path.join(path, name)
+                # unreadable headers are kept, so the run reports them as errors
+                if extension != '.inst' or stored_kind(name) in (None, PROBLEMS[problem]):
+                    found.append(name)
+        else:
+            found.append(path)
+    return found
+
+
+class RowWriter:
+    def __init__(self, stream, output_format):
+        self.stream = stream
+        self.csv = csv.DictWriter(stream, FIELDS) if output_format == 'csv' else None
+        if self.csv is not None:
+            self.csv.writeheader()
+
+    def write(self, row):
+        if self.csv is not None:
+            self.csv.writerow(row)
+        else:
+            self.stream.write(json.dumps(row) + '\n')
+        self.stream.flush()
+
+
+def solve(args):
+    paths = find_instances(args.instances, args.problem)
+    if not paths:
+        raise ValueError(f'no {args.problem} instances found in {", ".join(args.instances)}')
+    solver = args.solver or SOLVERS[args.problem][0]
+    if solver not in SOLVERS[args.problem]:
+        raise ValueError(f'solver {solver} is not available for {args.problem}, '
+                         f'expected one of {", ".join(SOLVERS[args.problem])}')
+    output_format = args.format or ('csv' if args.output.lower().endswith('.csv') else 'jsonl')
+    stream = sys.stdout if args.output == '-' else open(args.output, 'w', newline='')
+    failures = 0
+    try:
+        writer = RowWriter(stream, output_format)
+        with ProcessPoolExecutor(args.workers) as pool:
+            futures = [pool.submit(run_task, args.problem, solver, path, args.time_limit, args.seed + i)
+                       for i, path in enumerate(paths)]
+            for future in as_completed(futures):
+                row = future.result()
+                failures += row['status'] == 'error'
+                writer.write(row)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the solvers headless over many instance files.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('solve', help='solve every instance and write one row per run')
+    run.add_argument('--problem', choices=list(PROBLEMS), required=True)
+    run.add_argument('--instances', nargs='+', required=True, help='instance files and/or directories')
+    run.add_argument('--solver', help='; '.join(f'{problem}: {", ".join(names)}' for problem, names in SOLVERS.items())
+                     + ' (default: the first listed)')
+    run.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    run.add_argument('--time-limit', type=parse_duration, default=10.0, help='per run, e.g. 10s, 500ms, 2m')
+    run.add_argument('--output', default='-', help='.csv or .jsonl file, or - for stdout (default)')
+    run.add_argument('--format', choices=['csv', 'jsonl'], help='overrides the format implied by --output')
+    run.add_argument('--seed', type=int, default=0, help='run i uses seed + i')
+    args = parser.parse_args(argv)
+
+    try:
+        failures = solve(args)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
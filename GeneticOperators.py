@@ -0,0 +1,364 @@
+import numpy as np
+
+# Population-wide counterparts of the operators in CodeExamples.py. Instead of one Candidate at a
+# time, every operator works on a whole generation at once:
+#   selection(fitness, num, rng, ...)          -> (num,) int array of selected row indices
+#   crossover(parents1, parents2, rng, ...)    -> (num, length) child matrix
+#   mutation(children, rng, rate, ...)         -> children, mutated in place
+# fitness is a 1-D array where higher is better (as with Candidate.fitness), and the
+# proportional selections (roulette, SUS) expect it to be non-negative.
+#
+# Crossovers and mutations are written for one genome type: binary rows of booleans, or
+# permutation rows of 0..length-1. GENOME_TYPES records which, and lookup() rejects a mismatch.
+
+BINARY = 'binary'
+PERMUTATION = 'permutation'
+
+
+def random_selection(fitness, num, rng):
+    """
+    Select rows uniformly at random, ignoring fitness.
+
+    :param fitness: Fitness of every row of the population.
+    :param num: Number of rows to select.
+    :param rng: numpy Generator.
+    :return: Array of num selected row indices.
+    """
+    return rng.integers(0, len(fitness), num)
+
+
+def roulette_wheel_selection(fitness, num, rng):
+    """
+    Perform Roulette Wheel Selection for num parents at once.
+
+    :param fitness: Non-negative fitness of every row of the population.
+    :param num: Number of rows to select.
+    :param rng: numpy Generator.
+    :return: Array of num selected row indices.
+    """
+    cumulative = np.cumsum(fitness, dtype=np.float64)
+    if cumulative[-1] <= 0:
+        return random_selection(fitness, num, rng)
+    picks = np.searchsorted(cumulative, rng.random(num) * cumulative[-1], side='right')
+    return np.minimum(picks, len(fitness) - 1)
+
+
+def rank_based_selection(fitness, num, rng):
+    """
+    Perform Rank-Based Selection: roulette over ranks 1..n instead of raw fitness.
+
+    :param fitness: Fitness of every row of the population.
+    :param num: Number of rows to select.
+    :param rng: numpy Generator.
+    :return: Array of num selected row indices.
+    """
+    ranks = np.empty(len(fitness), dtype=np.float64)
+    ranks[np.argsort(fitness, kind='stable')] = np.arange(1, len(fitness) + 1)
+    return roulette_wheel_selection(ranks, num, rng)
+
+
+def tournament_selection(fitness, num, rng, tournament_size=3):
+    """
+    Perform Tournament Selection: one row of contestants per selection, winner by argmax.
+
+    :param fitness: Fitness of every row of the population.
+    :param num: Number of rows to select.
+    :param rng: numpy Generator.
+    :param tournament_size: Size of each tournament.
+    :return: Array of num selected row indices.
+    """
+    contestants = rng.integers(0, len(fitness), (num, tournament_size))
+    winners = np.argmax(fitness[contestants], axis=1)
+    return contestants[np.arange(num), winners]
+
+
+def stochastic_universal_sampling(fitness, num, rng):
+    """
+    Perform Stochastic Universal Sampling: num evenly spaced pointers from one random start.
+
+    :param fitness: Non-negative fitness of every row of the population.
+    :param num: Number of rows to select.
+    :param rng: numpy Generator.
+    :return: Array of num selected row indices, shuffled so consecutive picks are not neighbours.
+    """
+    cumulative = np.cumsum(fitness, dtype=np.float64)
+    if cumulative[-1] <= 0:
+        return random_selection(fitness, num, rng)
+    spacing = cumulative[-1] / num
+    pointers = rng.uniform(0, spacing) + spacing * np.arange(num)
+    picks = np.minimum(np.searchsorted(cumulative, pointers, side='right'), len(fitness) - 1)
+    return rng.permutation(picks)
+
+
+def truncation_selection(fitness, num, rng, truncation_percentage=0.5):
+    """
+    Perform Truncation Selection: uniform picks from the top fraction of the population.
+
+    :param fitness: Fitness of every row of the population.
+    :param num: Number of rows to select.
+    :param rng: numpy Generator.
+    :param truncation_percentage: Fraction of top rows to select from.
+    :return: Array of num selected row indices.
+    """
+    truncation_size = max(1, int(truncation_percentage * len(fitness)))
+    top = np.argsort(fitness, kind='stable')[::-1][:truncation_size]
+    return top[rng.integers(0, truncation_size, num)]
+
+
+def elitism_selection(fitness, num, rng, elite_fraction=0.1):
+    """
+    Perform Elitism Selection: uniform picks from the best elite_fraction of the population.
+
+    :param fitness: Fitness of every row of the population.
+    :param num: Number of rows to select.
+    :param rng: numpy Generator.
+    :param elite_fraction: Fraction of top rows to select from.
+    :return: Array of num selected row indices.
+    """
+    return truncation_selection(fitness, num, rng, elite_fraction)
+
+
+def single_point_crossover(parents1, parents2, rng, points=None):
+    """
+    Perform Single-point Crossover for every pair of rows.
+
+    :param parents1: (num, length) matrix of first parents.
+    :param parents2: (num, length) matrix of second parents.
+    :param rng: numpy Generator.
+    :param points: Optional crossover point per row, for callers that need to know them.
+    :return: (num, length) child matrix.
+    """
+    num, length = parents1.shape
+    if points is None:
+        points = rng.integers(0, length, num)
+    mask = np.arange(length)[None, :] < points[:, None]
+    return np.where(mask, parents1, parents2)
+
+
+def n_point_crossover(parents1, parents2, rng, n_points=2):
+    """
+    Perform N-point Crossover for every pair of rows.
+
+    Points are drawn independently per row, so a point drawn twice cancels out.
+
+    :param parents1: (num, length) matrix of first parents.
+    :param parents2: (num, length) matrix of second parents.
+    :param rng: numpy Generator.
+    :param n_points: Number of crossover points.
+    :return: (num, length) child matrix.
+    """
+    num, length = parents1.shape
+    if length < 2:
+        return parents1.copy()
+    toggles = np.zeros((num, length), dtype=np.uint8)
+    points = rng.integers(1, length, (num, n_points))
+    np.add.at(toggles, (np.repeat(np.arange(num), n_points), points.ravel()), 1)
+    # a gene comes from parent 2 after an odd number of crossover points
+    from_second = np.logical_xor.accumulate(toggles & 1, axis=1)
+    return np.where(from_second, parents2, parents1)
+
+
+def uniform_crossover(parents1, parents2, rng):
+    """
+    Perform Uniform Crossover: every gene comes from either parent with equal probability.
+
+    :param parents1: (num, length) matrix of first parents.
+    :param parents2: (num, length) matrix of second parents.
+    :param rng: numpy Generator.
+    :return: (num, length) child matrix.
+    """
+    return np.where(rng.random(parents1.shape) < 0.5, parents1, parents2)
+
+
+def order_crossover(parents1, parents2, rng):
+    """
+    Perform Order Crossover (OX) for every pair of permutation rows.
+
+    As in CodeExamples.order_crossover, each child keeps a random segment of parent 1 and fills
+    the remaining positions, left to right, with parent 2's other genes in parent 2's order.
+
+    :param parents1: (num, length) matrix of first parent permutations of 0..length-1.
+    :param parents2: (num, length) matrix of second parent permutations of 0..length-1.
+    :param rng: numpy Generator.
+    :return: (num, length) child matrix of permutations.
+    """
+    num, length = parents1.shape
+    if length < 2:
+        return parents1.copy()
+    rows = np.arange(num)[:, None]
+    start, end = segments(rng, num, length)
+    positions = np.arange(length)[None, :]
+    in_segment = (positions >= start[:, None]) & (positions < end[:, None])
+
+    # where each gene sits in parent 1, and so whether parent 2's genes are already in the segment
+    position_in_first = np.empty_like(parents1)
+    position_in_first[rows, parents1] = positions
+    taken = in_segment[rows, position_in_first[rows, parents2]]
+
+    # the free positions and parent 2's free genes line up once both are stably sorted to the front
+    free_positions = np.argsort(in_segment, axis=1, kind='stable')
+    free_genes = parents2[rows, np.argsort(taken, axis=1, kind='stable')]
+    children = np.empty_like(parents1)
+    children[rows, free_positions] = free_genes
+    return np.where(in_segment, parents1, children)
+
+
+def segments(rng, num, length):
+    """Random [start, end) bounds per row, with start < end as random.sample would give."""
+    first = rng.integers(0, length, num)
+    second = (first + rng.integers(1, length, num)) % length
+    return np.minimum(first, second), np.maximum(first, second)
+
+
+def mutated_rows(children, rng, rate):
+    return np.flatnonzero(rng.random(len(children)) < rate)
+
+
+def bit_flips(num, length, rng, rate):
+    """Rows chosen with probability rate and one random column in each, for bit_flip_mutation."""
+    rows = np.flatnonzero(rng.random(num) < rate)
+    return rows, rng.integers(0, length, len(rows))
+
+
+def bit_flip_mutation(children, rng, rate):
+    """
+    Flip one random gene in each row chosen with probability rate.
+
+    :param children: (num, length) boolean child matrix, mutated in place.
+    :param rng: numpy Generator.
+    :param rate: Probability that a row is mutated.
+    :return: The mutated children.
+    """
+    rows, cols = bit_flips(len(children), children.shape[1], rng, rate)
+    children[rows, cols] ^= True
+    return children
+
+
+def uniform_mutation(children, rng, rate, mutation_probability=0.01):
+    """
+    Flip every gene independently with mutation_probability, in rows chosen with probability rate.
+
+    :param children: (num, length) boolean child matrix, mutated in place.
+    :param rng: numpy Generator.
+    :param rate: Probability that a row is mutated.
+    :param mutation_probability: Per-gene flip probability within a mutated row.
+    :return: The mutated children.
+    """
+    rows = mutated_rows(children, rng, rate)
+    children[rows] ^= rng.random((len(rows), children.shape[1])) < mutation_probability
+    return children
+
+
+def swap_mutation(children, rng, rate):
+    """
+    Swap two random genes in each row chosen with probability rate.
+
+    :param children: (num, length) child matrix, mutated in place.
+    :param rng: numpy Generator.
+    :param rate: Probability that a row is mutated.
+    :return: The mutated children.
+    """
+    if children.shape[1] < 2:
+        return children
+    rows = mutated_rows(children, rng, rate)
+    first, second = segments(rng, len(rows), children.shape[1])
+    children[rows, first], children[rows, second] = children[rows, second], children[rows, first]
+    return children
+
+
+def inversion_mutation(children, rng, rate):
+    """
+    Reverse a random slice of each row chosen with probability rate.
+
+    :param children: (num, length) child matrix, mutated in place.
+    :param rng: numpy Generator.
+    :param rate: Probability that a row is mutated.
+    :return: The mutated children.
+    """
+    if children.shape[1] < 2:
+        return children
+    rows = mutated_rows(children, rng, rate)
+    start, end = segments(rng, len(rows), children.shape[1])
+    positions = np.arange(children.shape[1])[None, :]
+    inside = (positions >= start[:, None]) & (positions < end[:, None])
+    source = np.where(inside, start[:, None] + end[:, None] - 1 - positions, positions)
+    children[rows] = np.take_along_axis(children[rows], source, axis=1)
+    return children
+
+
+def scramble_mutation(children, rng, rate):
+    """
+    Shuffle a random slice of each row chosen with probability rate.
+
+    :param children: (num, length) child matrix, mutated in place.
+    :param rng: numpy Generator.
+    :param rate: Probability that a row is mutated.
+    :return: The mutated children.
+    """
+    if children.shape[1] < 2:
+        return children
+    rows = mutated_rows(children, rng, rate)
+    start, end = segments(rng, len(rows), children.shape[1])
+    positions = np.arange(children.shape[1])[None, :]
+    inside = (positions >= start[:, None]) & (positions < end[:, None])
+    # sort keys: positions outside the slice keep their index, inside get a random key within it
+    keys = np.where(inside, start[:, None] + rng.random(inside.shape) * (end - start)[:, None], positions)
+    children[rows] = np.take_along_axis(children[rows], np.argsort(keys, axis=1, kind='stable'), axis=1)
+    return children
+
+
+SELECTIONS = {
+    'random': random_selection,
+    'roulette': roulette_wheel_selection,
+    'rank': rank_based_selection,
+    'tournament': tournament_selection,
+    'sus': stochastic_universal_sampling,
+    'truncation': truncation_selection,
+    'elitism': elitism_selection,
+}
+
+CROSSOVERS = {
+    'single_point': single_point_crossover,
+    'n_point': n_point_crossover,
+    'uniform': uniform_crossover,
+    'order': order_crossover,
+}
+
+MUTATIONS = {
+    'bit_flip': bit_flip_mutation,
+    'uniform': uniform_mutation,
+    'swap': swap_mutation,
+    'inversion': inversion_mutation,
+    'scramble': scramble_mutation,
+}
+
+# position-wise crossovers and bit flips break permutations; OX needs permutations, and the
+# reordering mutations only move a binary row's bits around
+GENOME_TYPES = {
+    single_point_crossover: BINARY,
+    n_point_crossover: BINARY,
+    uniform_crossover: BINARY,
+    order_crossover: PERMUTATION,
+    bit_flip_mutation: BINARY,
+    uniform_mutation: BINARY,
+    swap_mutation: PERMUTATION,
+    inversion_mutation: PERMUTATION,
+    scramble_mutation: PERMUTATION,
+}
+
+
+def lookup(table, name, genome=None):
+    """
+    Find an operator by name in SELECTIONS, CROSSOVERS or MUTATIONS.
+
+    :param table: One of the operator tables.
+    :param name: Registered operator name.
+    :param genome: Optional genome type (BINARY or PERMUTATION) the operator must be written for.
+    :return: The operator function.
+    """
+    if genome is not None:
+        table = {key: operator for key, operator in table.items() if GENOME_TYPES.get(operator, genome) == genome}
+    if name not in table:
+        kind = '' if genome is None else f'{genome} '
+        raise ValueError(f'unknown {kind}operator {name!r}, expected one of {", ".join(table)}')
+    return table[name]
@@ -1,9 +1,397 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import filedialog, ttk
 import numpy as np
 import random
+import heapq
+import time
 import colorsys
 
+import InstanceFile
+
+max_drawn_vertices = 500  # larger graphs are solved without being drawn
+
+class Graph:
+    """Undirected graph stored as CSR adjacency (indptr/indices) plus an edge list."""
+
+    def __init__(self, n, edges):
+        self.n = n
+        self.edges = np.asarray(edges, dtype=np.int32).reshape(-1, 2)
+        both = np.concatenate((self.edges, self.edges[:, ::-1]))
+        order = np.lexsort((both[:, 1], both[:, 0]))
+        self.indices = np.ascontiguousarray(both[order, 1])
+        self.indptr = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(both[:, 0], minlength=n), out=self.indptr[1:])
+
+    @classmethod
+    def from_csr(cls, n, indptr, indices, edges):
+        """Wrap existing CSR arrays (e.g. memory-mapped from an instance file) without rebuilding them."""
+        graph = cls.__new__(cls)
+        graph.n = n
+        graph.indptr, graph.indices, graph.edges = indptr, indices, edges
+        return graph
+
+    @classmethod
+    def random(cls, n, num_edges):
+        """Random simple graph with num_edges distinct edges (capped at the complete graph)."""
+        num_edges = min(num_edges, n * (n - 1) // 2)
+        edges = set()
+        while len(edges) < num_edges:
+            v1, v2 = random.sample(range(n), 2)
+            edges.add((min(v1, v2), max(v1, v2)))
+        return cls(n, sorted(edges))
+
+    def neighbors(self, vertex):
+        return self.indices[self.indptr[vertex]:self.indptr[vertex + 1]]
+
+    def degrees(self):
+        return np.diff(self.indptr)
+
+class ConflictTracker:
+    """Per-vertex conflict counts for one coloring, updated in O(degree) per recolor."""
+
+    def __init__(self, graph, colors):
+        self.neighbors = graph.neighbors
+        self.colors = np.array(colors, dtype=int)
+        u, v = graph.edges[:, 0], graph.edges[:, 1]
+        same = (self.colors[u] == self.colors[v]) & (self.colors[u] >= 0)
+        self.conflicts = np.bincount(u[same], minlength=graph.n) + np.bincount(v[same], minlength=graph.n)
+        self.total = int(np.count_nonzero(same))
+
+    def set_color(self, vertex, color):
+        """Recolor a vertex and update the counts of it and its neighbors."""
+        old = self.colors[vertex]
+        adjacent = self.neighbors(vertex)
+        if old >= 0:
+            same = adjacent[self.colors[adjacent] == old]
+            self.conflicts[same] -= 1
+            self.total -= len(same)
+        self.colors[vertex] = color
+        same = adjacent[self.colors[adjacent] == color] if color >= 0 else adjacent[:0]
+        self.conflicts[same] += 1
+        self.conflicts[vertex] = len(same)
+        self.total += len(same)
+
+    def conflicting_vertices(self):
+        return np.flatnonzero(self.conflicts)
+
+
+class DSaturSolver:
+    """Exact minimum coloring: iterative DSatur backtracking with bitmask domains and forward checking."""
+
+    def __init__(self, graph, node_budget=1000000, time_budget=10.0):
+        self.graph = graph
+        self.adjacency = [graph.neighbors(v).tolist() for v in range(graph.n)]
+        self.degree = [len(adjacent) for adjacent in self.adjacency]
+        self.node_budget = node_budget
+        self.time_budget = time_budget
+        self.nodes = 0
+        self.deadline = None
+        self.exhausted = False
+
+    def out_of_time(self):
+        return self.deadline is not None and time.perf_counter() > self.deadline
+
+    def select_vertex(self, colors, domains, heap):
+        """Uncolored vertex with the fewest remaining colors, ties broken by degree.
+
+        heap holds (colors left, -degree, vertex) entries pushed whenever a domain changes;
+        entries for colored vertices or outdated domains are skipped here."""
+        while heap:
+            count, _, v = heap[0]
+            if colors[v] < 0 and domains[v].bit_count() == count:
+                return v
+            heapq.heappop(heap)
+        return -1
+
+    def greedy(self):
+        """DSatur greedy coloring, used as the upper bound; first-fit finishes it if time runs out."""
+        n = self.graph.n
+        colors = [-1] * n
+        used = [0] * n  # bitmask of colors already taken by neighbors
+
+        def assign(vertex, heap):
+            # lowest color not used by a neighbor
+            color = (~used[vertex] & (used[vertex] + 1)).bit_length() - 1
+            colors[vertex] = color
+            bit = 1 << color
+            for u in self.adjacency[vertex]:
+                if colors[u] < 0 and not used[u] & bit:
+                    used[u] |= bit
+                    if heap is not None:
+                        heapq.heappush(heap, (-used[u].bit_count(), -self.degree[u], u))
+
+        # max-saturation heap with lazy deletion: (-saturation, -degree, vertex)
+        heap = [(0, -self.degree[v], v) for v in range(n)]
+        heapq.heapify(heap)
+        colored = 0
+        while heap:
+            saturation, _, vertex = heapq.heappop(heap)
+            if colors[vertex] >= 0 or -saturation != used[vertex].bit_count():
+                continue
+            assign(vertex, heap)
+            colored += 1
+            if colored & 1023 == 0 and self.out_of_time():
+                break
+        for vertex in range(n):
+            if colors[vertex] < 0:
+                assign(vertex, None)
+        return colors
+
+    def clique_lower_bound(self, tries=50):
+        """Size of a greedily grown clique, a lower bound on the chromatic number."""
+        best = 1 if self.graph.n else 0
+        for v in sorted(range(self.graph.n), key=lambda v: -self.degree[v])[:tries]:
+            if self.out_of_time():
+                break
+            clique_size = 1
+            candidates = set(self.adjacency[v])
+            while candidates:
+                u = max(candidates, key=lambda u: self.degree[u])
+                clique_size += 1
+                candidates &= set(self.adjacency[u])
+            best = max(best, clique_size)
+        return best
+
+    def color_with(self, k):
+        """Search for a k-coloring; returns the colors, or None if none exists or the budget ran out."""
+        n = self.graph.n
+        colors = [-1] * n
+        domains = [(1 << k) - 1] * n
+        trail = []  # (vertex, previous domain) for undoing forward checks
+        heap = [(k, -self.degree[v], v) for v in range(n)]
+        heapq.heapify(heap)
+        vertex = self.select_vertex(colors, domains, heap)
+        if vertex < 0:
+            return colors
+        # each frame: vertex, colors still to try, trail length before it was colored, colors in use
+        stack = [[vertex, domains[vertex] & 1, len(trail), 0]]
+        while stack:
+            frame = stack[-1]
+            vertex, candidates, trail_length, used = frame
+            while len(trail) > trail_length:
+                u, domain = trail.pop()
+                domains[u] = domain
+                heapq.heappush(heap, (domain.bit_count(), -self.degree[u], u))
+            colors[vertex] = -1
+            heapq.heappush(heap, (domains[vertex].bit_count(), -self.degree[vertex], vertex))
+            if not candidates:
+                stack.pop()
+                continue
+            color = (candidates & -candidates).bit_length() - 1
+            frame[1] = candidates & ~(1 << color)
+
+            self.nodes += 1
+            if self.nodes >= self.node_budget or (self.nodes & 1023 == 0 and self.out_of_time()):
+                self.exhausted = True
+                return None
+
+            colors[vertex] = color
+            bit = 1 << color
+            wipeout = False
+            for u in self.adjacency[vertex]:
+                if colors[u] < 0 and domains[u] & bit:
+                    trail.append((u, domains[u]))
+                    domains[u] &= ~bit
+                    if not domains[u]:
+                        wipeout = True
+                        break
+                    heapq.heappush(heap, (domains[u].bit_count(), -self.degree[u], u))
+            if wipeout:
+                continue
+
+            next_vertex = self.select_vertex(colors, domains, heap)
+            if next_vertex < 0:
+                return colors
+            next_used = max(used, color + 1)
+            # colors above next_used are interchangeable, so only the first unused one is tried
+            allowed = domains[next_vertex] & ((1 << min(next_used + 1, k)) - 1)
+            stack.append([next_vertex, allowed, len(trail), next_used])
+        return None
+
+    def solve(self):
+        """Minimum coloring found within budget, its color count, and whether it is proven optimal."""
+        self.deadline = time.perf_counter() + self.time_budget
+        best = self.greedy()
+        upper = max(best) + 1 if best else 0
+        for k in range(self.clique_lower_bound(), upper):
+            colors = self.color_with(k)
+            if colors is not None:
+                return colors, k, True
+            if self.exhausted:
+                return best, upper, False
+        return best, upper, True
+
+
+class TabucolSolver:
+    """Tabucol local search: (vertex, color) tabu moves scored from an incrementally updated gamma matrix."""
+
+    def __init__(self, graph, max_iterations=100000, time_budget=10.0, rng=None):
+        self.graph = graph
+        self.max_iterations = max_iterations
+        self.time_budget = time_budget
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.iterations = 0
+        self.deadline = None
+        self.best_time = None  # seconds from the start of solve() to the final coloring
+
+    def tabucol(self, colors, k):
+        """Minimize conflicts of a k-coloring; returns the best coloring and its conflict count."""
+        n, edges = self.graph.n, self.graph.edges
+        colors = np.array(colors, dtype=np.int64)
+        # gamma[v, c]: number of neighbors of v that have color c
+        gamma = np.zeros((n, k), dtype=np.int64)
+        np.add.at(gamma, (edges[:, 0], colors[edges[:, 1]]), 1)
+        np.add.at(gamma, (edges[:, 1], colors[edges[:, 0]]), 1)
+        tabu = np.zeros((n, k), dtype=np.int64)
+        # own[v]: neighbors sharing v's color; only the vertices in conflict are scored for moves
+        own = gamma[np.arange(n), colors]
+        in_conflict = set(np.flatnonzero(own).tolist())
+        total = int(np.count_nonzero(colors[edges[:, 0]] == colors[edges[:, 1]]))
+        best_colors, best_total = colors.copy(), total
+
+        for iteration in range(self.max_iterations):
+            if total == 0 or (iteration & 255 == 0 and time.perf_counter() > self.deadline):
+                break
+            self.iterations += 1
+            conflicting = np.fromiter(in_conflict, dtype=np.int64, count=len(in_conflict))
+            deltas = (gamma[conflicting] - own[conflicting, None]).astype(float)
+            deltas[np.arange(len(conflicting)), colors[conflicting]] = np.inf
+            # best non-tabu move, or a tabu one that beats the best coloring so far
+            allowed = (tabu[conflicting] <= iteration) | (total + deltas < best_total)
+            deltas[~allowed] = np.inf
+            best_delta = deltas.min()
+            if best_delta == np.inf:
+                continue
+            rows, cols = np.nonzero(deltas == best_delta)
+            choice = self.rng.integers(len(rows))
+            vertex, color = conflicting[rows[choice]], cols[choice]
+
+            old = colors[vertex]
+            adjacent = self.graph.neighbors(vertex)
+            gamma[adjacent, old] -= 1
+            gamma[adjacent, color] += 1
+            adjacent_colors = colors[adjacent]
+            lost, gained = adjacent[adjacent_colors == old], adjacent[adjacent_colors == color]
+            own[lost] -= 1
+            own[gained] += 1
+            own[vertex] = gamma[vertex, color]
+            in_conflict.difference_update(lost[own[lost] == 0].tolist())
+            in_conflict.update(gained.tolist())
+            if own[vertex]:
+                in_conflict.add(int(vertex))
+            else:
+                in_conflict.discard(int(vertex))
+            colors[vertex] = color
+            total += int(best_delta)
+            tabu[vertex, old] = iteration + int(0.6 * len(conflicting)) + self.rng.integers(10)
+            if total < best_total:
+                best_colors, best_total = colors.copy(), total
+        return best_colors, best_total
+
+    def solve(self):
+        """Start from a DSatur coloring and keep removing a color while Tabucol can repair the conflicts."""
+        start_time = time.perf_counter()
+        self.deadline = start_time + self.time_budget
+        dsatur = DSaturSolver(self.graph)
+        dsatur.deadline = self.deadline
+        colors = np.array(dsatur.greedy(), dtype=np.int64)
+        k = int(colors.max()) + 1 if len(colors) else 0
+        self.best_time = time.perf_counter() - start_time
+        lower = dsatur.clique_lower_bound()
+        while k > lower and time.perf_counter() < self.deadline:
+            start = colors.copy()
+            dropped = start >= k - 1
+            start[dropped] = self.rng.integers(0, k - 1, np.count_nonzero(dropped))
+            candidate, conflicts = self.tabucol(start, k - 1)
+            if conflicts:
+                break
+            colors, k = candidate, k - 1
+            self.best_time = time.perf_counter() - start_time
+        return colors, k
+
+
+class AntColSolver:
+    """ANTCOL-style ACO: ants color vertices in sequence, weighing pheromone against conflicts with colored neighbors."""
+
+    def __init__(self, graph, k, num_ants=20, iterations=100, alpha=1.0, beta=8.0, evaporation_rate=0.1,
+                 rng=None, progress=None):
+        self.graph = graph
+        self.k = k
+        self.num_ants = num_ants
+        self.iterations = iterations
+        self.alpha = alpha
+        self.beta = beta
+        self.evaporation_rate = evaporation_rate
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.progress = progress
+        self.iteration = 0
+        # static largest-degree-first order, shared by all ants so they can be built side by side
+        self.order = np.argsort(-graph.degrees(), kind="stable")
+
+    def construct(self, pheromone):
+        """Build one coloring per ant; returns a (num_ants, n) color matrix."""
+        colors = np.full((self.num_ants, self.graph.n), -1, dtype=np.int64)
+        palette = np.arange(self.k)
+        weights = pheromone ** self.alpha
+        ants = np.arange(self.num_ants)
+        for vertex in self.order:
+            adjacent = colors[:, self.graph.neighbors(vertex)]
+            # visibility: fewer already-colored neighbors using a color makes it more attractive
+            clashes = (adjacent[:, :, None] == palette).sum(axis=1)
+            scores = weights[vertex] * (1.0 / (1.0 + clashes)) ** self.beta
+            cdf = np.cumsum(scores, axis=1)
+            draws = self.rng.random(self.num_ants) * cdf[:, -1]
+            colors[ants, vertex] = np.minimum((draws[:, None] > cdf).sum(axis=1), self.k - 1)
+        return colors
+
+    def cost(self, colorings):
+        edges = self.graph.edges
+        return np.count_nonzero(colorings[:, edges[:, 0]] == colorings[:, edges[:, 1]], axis=1)
+
+    def repair(self, colors):
+        """Min-conflicts descent: recolor conflicting vertices while that removes conflicts."""
+        tracker = ConflictTracker(self.graph, colors)
+        improved = True
+        while improved and tracker.total:
+            improved = False
+            for vertex in tracker.conflicting_vertices():
+                if not tracker.conflicts[vertex]:
+                    continue  # fixed by an earlier move in this sweep
+                counts = np.bincount(tracker.colors[self.graph.neighbors(vertex)], minlength=self.k)
+                color = int(np.argmin(counts))
+                if counts[color] < counts[tracker.colors[vertex]]:
+                    tracker.set_color(vertex, color)
+                    improved = True
+        return tracker.colors, tracker.total
+
+    def solve(self):
+        """Max-min ant system run that stops as soon as a conflict-free coloring appears."""
+        n = self.graph.n
+        tau_max = 1.0
+        tau_min = tau_max / (50 * max(self.k, 1))
+        pheromone = np.full((n, self.k), tau_max)
+        best_colors, best_cost = None, None
+        vertices = np.arange(n)
+
+        for self.iteration in range(1, self.iterations + 1):
+            colorings = self.construct(pheromone)
+            costs = self.cost(colorings)
+            # the iteration's best ant is polished with the incremental conflict tracker
+            colors, cost = self.repair(colorings[int(np.argmin(costs))])
+            if best_cost is None or cost < best_cost:
+                best_colors, best_cost = colors, cost
+
+            # elitist max-min update: only the best-so-far coloring deposits, trails stay in [tau_min, tau_max]
+            pheromone *= (1 - self.evaporation_rate)
+            pheromone[vertices, best_colors] += 1.0 / (1 + best_cost)
+            np.clip(pheromone, tau_min, tau_max, out=pheromone)
+
+            if self.progress is not None:
+                self.progress(self.iteration, best_cost)
+            if best_cost == 0:
+                break
+        return best_colors, best_cost
+
 class GraphColoringApp:
     def __init__(self, root):
         self.root = root
@@ -11,6 +399,15 @@ class GraphColoringApp:
         self.root.geometry("600x700")
         self.root.configure(bg="#f0f0f0")
 
+        # Menu bar
+        menu = tk.Menu(root)
+        file_menu = tk.Menu(menu, tearoff=0)
+        menu.add_cascade(label="File", menu=file_menu)
+        file_menu.add_command(label="Open...", command=self.open_graph)
+        file_menu.add_separator()
+        file_menu.add_command(label="Exit", command=root.quit)
+        root.config(menu=menu)
+
         # Style configuration
         self.style = ttk.Style()
         self.style.configure("TLabel", background="#f0f0f0", font=("Arial", 10))
@@ -28,7 +425,7 @@ class GraphColoringApp:
         # Solver selection dropdown
         ttk.Label(control_frame, text="Solver:").grid(row=0, column=2, sticky=tk.W, padx=5, pady=5)
         self.solver_var = tk.StringVar(value="Backtracking")
-        self.solver_dropdown = ttk.Combobox(control_frame, textvariable=self.solver_var, values=["Backtracking", "Ant Colony Optimization"], state="readonly")
+        self.solver_dropdown = ttk.Combobox(control_frame, textvariable=self.solver_var, values=["Backtracking", "Ant Colony Optimization", "Tabu Search (Tabucol)", "ACO (ANTCOL)"], state="readonly")
         self.solver_dropdown.grid(row=0, column=3, padx=5, pady=5)
 
         # Create graph button
@@ -72,41 +469,53 @@ class GraphColoringApp:
             if self.n < 3:
                 raise ValueError("Number of vertices must be at least 3.")
 
-            # Initialize the adjacency matrix with zeros
-            self.graph = np.zeros((self.n, self.n), dtype=int)
-
-            # Create random edges
+            # Create random edges, stored as CSR adjacency
             num_edges_to_add = int(self.n * 2)  # Adjust this number to add more edges
-            for _ in range(num_edges_to_add):
-                v1, v2 = random.sample(range(self.n), 2)
-                while self.graph[v1][v2] == 1 or v1 == v2:  # Ensure no self-loop and no duplicate edges
-                    v1, v2 = random.sample(range(self.n), 2)
-                self.graph[v1][v2] = 1
-                self.graph[v2][v1] = 1  # Since the graph is undirected
-
-            # Calculate vertex positions for visualization
-            radius = 180
-            center_x, center_y = 250, 200
-            self.positions = [
-                (
-                    center_x + radius * np.cos(2 * np.pi * i / self.n),
-                    center_y + radius * np.sin(2 * np.pi * i / self.n),
-                )
-                for i in range(self.n)
-            ]
-
-            # Reset the canvas and UI elements
-            self.canvas.delete("all")
-            self.solution_label.config(text="")
-            self.generation_label.config(text="Iterations: 0")
-            self.draw_graph()
-
-            # Enable solve button
-            self.solve_button.config(state=tk.NORMAL)
+            self.show_graph(Graph.random(self.n, num_edges_to_add))
 
         except ValueError as e:
             self.solution_label.config(text=f"Error: {e}", foreground="red")
 
+    def open_graph(self):
+        """Load a DIMACS (.col, optionally gzipped) or binary instance file."""
+        path = filedialog.askopenfilename(
+            title="Open Graph", filetypes=[("Graph instances", "*.col *.col.gz *.inst"), ("All files", "*")])
+        if not path:
+            return
+        try:
+            instance = InstanceFile.read(path)
+            if instance.kind != InstanceFile.COLORING:
+                raise ValueError(f"{path} is not a graph coloring instance")
+        except (OSError, ValueError) as e:
+            self.solution_label.config(text=f"Error: {e}", foreground="red")
+            return
+        self.n = instance.n
+        self.vertex_entry.delete(0, tk.END)
+        self.vertex_entry.insert(0, str(self.n))
+        self.show_graph(Graph.from_csr(instance.n, instance['indptr'], instance['indices'], instance['edges']))
+        self.solution_label.config(text=f"Loaded {instance.name} ({instance.n} vertices, {instance.m} edges)",
+                                   foreground="green")
+
+    def show_graph(self, graph):
+        """Install a new graph, lay it out on a circle and enable solving."""
+        self.graph = graph
+
+        # Calculate vertex positions for visualization
+        radius = 180
+        center_x, center_y = 250, 200
+        angles = 2 * np.pi * np.arange(self.n) / max(self.n, 1)
+        self.positions = list(zip((center_x + radius * np.cos(angles)).tolist(),
+                                  (center_y + radius * np.sin(angles)).tolist()))
+
+        # Reset the canvas and UI elements
+        self.canvas.delete("all")
+        self.solution_label.config(text="")
+        self.generation_label.config(text="Iterations: 0")
+        self.draw_graph()
+
+        # Enable solve button
+        self.solve_button.config(state=tk.NORMAL)
+
     def generate_distinct_colors(self, num_colors):
         """Generate visually distinct colors."""
         colors = []
@@ -120,17 +529,18 @@ class GraphColoringApp:
     def draw_graph(self, colors=None):
         """Draws the graph with optional vertex coloring."""
         self.canvas.delete("all")
+        if self.n > max_drawn_vertices:
+            self.canvas.create_text(250, 200, text=f"{self.n} vertices: too large to draw", fill="gray")
+            return
 
         # Generate color palette
         color_palette = self.generate_distinct_colors(self.max_colors)
 
         # Draw edges
-        for i in range(self.n):
-            for j in range(i+1, self.n):  # Avoid duplicate edges
-                if self.graph[i][j] == 1:
-                    x1, y1 = self.positions[i]
-                    x2, y2 = self.positions[j]
-                    self.canvas.create_line(x1, y1, x2, y2, fill="gray", width=2)
+        for i, j in self.graph.edges:
+            x1, y1 = self.positions[i]
+            x2, y2 = self.positions[j]
+            self.canvas.create_line(x1, y1, x2, y2, fill="gray", width=2)
 
         # Draw vertices
         for i, (x, y) in enumerate(self.positions):
@@ -152,13 +562,6 @@ class GraphColoringApp:
         self.solve_button.config(state=tk.DISABLED)
         self.vertex_entry.delete(0, tk.END)
 
-    def is_safe_color(self, vertex, color, colors):
-        """Check if a color is safe for the given vertex."""
-        for i in range(self.n):
-            if self.graph[vertex][i] and colors[i] == color:
-                return False
-        return True
-
     def solve_graph_coloring(self):
         """Main function to solve graph coloring."""
         selected_solver = self.solver_var.get()
@@ -167,20 +570,34 @@ class GraphColoringApp:
             self.solve_with_backtracking()
         elif selected_solver == "Ant Colony Optimization":
             self.solve_with_aco()
+        elif selected_solver == "Tabu Search (Tabucol)":
+            self.solve_with_tabucol()
+        elif selected_solver == "ACO (ANTCOL)":
+            self.solve_with_antcol()
 
     def solve_with_backtracking(self):
-        """Solve graph coloring using backtracking."""
-        self.max_colors = max(4, int(np.sqrt(self.n)) + 1)
-        colors = [-1] * self.n
-        iterations = [0]
-
-        if self.solve_graph_coloring_util(colors, 0, iterations):
-            self.solution_label.config(text="Solution Found!", foreground="green")
-            self.draw_graph(colors)
+        """Find a minimum coloring with DSatur backtracking."""
+        solver = DSaturSolver(self.graph)
+        colors, k, optimal = solver.solve()
+        self.max_colors = max(k, 1)
+
+        if optimal:
+            self.solution_label.config(text=f"Optimal Solution Found! ({k} colors)", foreground="green")
         else:
-            self.solution_label.config(text="No solution found", foreground="red")
+            self.solution_label.config(text=f"Solution Found ({k} colors, search budget exhausted)", foreground="orange")
+        self.draw_graph(colors)
+
+        self.generation_label.config(text=f"Iterations: {solver.nodes}")
 
-        self.generation_label.config(text=f"Iterations: {iterations[0]}")
+    def solve_with_tabucol(self):
+        """Find a coloring with as few colors as possible using Tabucol."""
+        solver = TabucolSolver(self.graph)
+        colors, k = solver.solve()
+        self.max_colors = max(k, 1)
+
+        self.solution_label.config(text=f"Solution Found with Tabu Search! ({k} colors)", foreground="green")
+        self.draw_graph(colors)
+        self.generation_label.config(text=f"Iterations: {solver.iterations}")
 
     def solve_with_aco(self):
         """Solve graph coloring using Ant Colony Optimization."""
@@ -191,29 +608,25 @@ class GraphColoringApp:
         best_colors = None
         best_cost = float('inf')
 
-        for iteration in range(iterations):
-            all_colors = []
-            all_costs = []
-
-            for ant in range(num_ants):
-                colors = [-1] * self.n
-                for vertex in range(self.n):
-                    probabilities = pheromone[vertex] / pheromone[vertex].sum()
-                    chosen_color = np.random.choice(self.max_colors, p=probabilities)
-                    colors[vertex] = chosen_color
-
-                cost = self.calculate_cost(colors)
-                all_colors.append(colors)
-                all_costs.append(cost)
+        vertices = np.arange(self.n)
 
-                if cost < best_cost:
-                    best_colors = colors
-                    best_cost = cost
+        for iteration in range(iterations):
+            # Sample every ant's color for every vertex at once by inverse-CDF lookup
+            cdf = np.cumsum(pheromone, axis=1)
+            cdf /= cdf[:, -1:]
+            draws = np.random.random((num_ants, self.n, 1))
+            all_colors = np.minimum((draws > cdf).sum(axis=2), self.max_colors - 1)
+
+            # Score the whole colony at once
+            all_costs = self.calculate_batch_cost(all_colors)
+            best_ant = int(np.argmin(all_costs))
+            if all_costs[best_ant] < best_cost:
+                best_colors = all_colors[best_ant]
+                best_cost = int(all_costs[best_ant])
 
             pheromone *= (1 - evaporation_rate)
-            for colors, cost in zip(all_colors, all_costs):
-                for vertex, color in enumerate(colors):
-                    pheromone[vertex][color] += 1.0 / (1 + cost)
+            np.add.at(pheromone, (np.tile(vertices, num_ants), all_colors.ravel()),
+                      np.repeat(1.0 / (1 + all_costs), self.n))
 
             self.generation_label.config(text=f"Iterations: {iteration + 1}")
             self.root.update_idletasks()
@@ -224,29 +637,26 @@ class GraphColoringApp:
         else:
             self.solution_label.config(text="No perfect solution found with ACO.", foreground="red")
 
-    def calculate_cost(self, colors):
-        """Calculate the cost of a color assignment."""
-        cost = 0
-        for i in range(self.n):
-            for j in range(i + 1, self.n):
-                if self.graph[i][j] == 1 and colors[i] == colors[j]:
-                    cost += 1
-        return cost
-
-    def solve_graph_coloring_util(self, colors, vertex, iterations):
-        if vertex == self.n:
-            return True
-
-        iterations[0] += 1
-
-        for color in range(self.max_colors):
-            if self.is_safe_color(vertex, color, colors):
-                colors[vertex] = color
-                if self.solve_graph_coloring_util(colors, vertex + 1, iterations):
-                    return True
-                colors[vertex] = -1
-
-        return False
+    def solve_with_antcol(self):
+        """Solve graph coloring using conflict-aware ANTCOL-style ant colonies."""
+        def progress(iteration, cost):
+            self.generation_label.config(text=f"Iterations: {iteration}")
+            self.root.update_idletasks()
+
+        solver = AntColSolver(self.graph, self.max_colors, progress=progress)
+        best_colors, best_cost = solver.solve()
+
+        if best_cost == 0:
+            self.solution_label.config(text=f"Solution Found with ANTCOL after {solver.iteration} iterations!",
+                                       foreground="green")
+            self.draw_graph(best_colors)
+        else:
+            self.solution_label.config(text=f"No perfect solution found with ANTCOL ({best_cost} conflicts).",
+                                       foreground="red")
+
+    def calculate_batch_cost(self, colorings):
+        """Calculate the cost of every row of a (num_colorings, n) color matrix."""
+        return np.count_nonzero(colorings[:, self.graph.edges[:, 0]] == colorings[:, self.graph.edges[:, 1]], axis=1)
 
 def main():
     root = tk.Tk()
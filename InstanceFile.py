@@ -0,0 +1,319 @@
+import argparse
+import gzip
+import os
+from array import array
+
+import numpy as np
+
+# Binary instance file: a fixed 64-byte header followed by the problem's typed arrays,
+# each starting on an 8-byte boundary so the whole file can be memory-mapped as is.
+MAGIC = b'UTPBINST'
+VERSION = 1
+
+KNAPSACK = 1
+TSP = 2
+COLORING = 3
+KIND_NAMES = {KNAPSACK: 'knapsack', TSP: 'tsp', COLORING: 'coloring'}
+
+HAS_WEIGHTS = 1
+
+# Text parsing: lines (or bytes, for DIMACS) handed to NumPy per call, and the TSPLIB distance types whose
+# coordinates the solvers can use directly. The solvers measure plain (unrounded) Euclidean lengths, so
+# ATT and CEIL_2D, whose lengths are scaled or rounded differently, are rejected rather than mismeasured.
+chunk_lines = 1 << 16
+chunk_bytes = 1 << 22
+EUCLIDEAN_TYPES = ('EUC_2D',)
+
+HEADER = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u4'),
+    ('kind', '<u4'),
+    ('n', '<u8'),
+    ('m', '<u8'),
+    ('target', '<i8'),
+    ('flags', '<u8'),
+    ('reserved', '<u8', 2),
+])
+
+
+class Instance:
+    def __init__(self, kind, n, m=0, target=0, arrays=None, name=''):
+        self.kind = kind
+        self.n = n
+        self.m = m
+        self.target = target
+        self.arrays = arrays if arrays is not None else {}
+        self.name = name
+
+    def __getitem__(self, key):
+        return self.arrays[key]
+
+    def __contains__(self, key):
+        return key in self.arrays
+
+
+def knapsack_instance(values, target, weights=None, name=''):
+    arrays = {'values': np.asarray(values, dtype='<i8')}
+    if weights is not None:
+        arrays['weights'] = np.asarray(weights, dtype='<i8')
+    return Instance(KNAPSACK, len(arrays['values']), target=target, arrays=arrays, name=name)
+
+
+def tsp_instance(xs, ys, name=''):
+    arrays = {'xs': np.asarray(xs, dtype='<f8'), 'ys': np.asarray(ys, dtype='<f8')}
+    return Instance(TSP, len(arrays['xs']), arrays=arrays, name=name)
+
+
+def coloring_instance(n, edges, name=''):
+    """Graph instance from an (m, 2) edge list; the CSR adjacency is built here so loading never has to."""
+    edges = np.asarray(edges, dtype='<i4').reshape(-1, 2)
+    both = np.concatenate((edges, edges[:, ::-1]))
+    order = np.argsort(both[:, 0].astype(np.int64) * n + both[:, 1])
+    indptr = np.zeros(n + 1, dtype='<i8')
+    np.cumsum(np.bincount(both[:, 0], minlength=n), out=indptr[1:])
+    arrays = {'edges': edges, 'indptr': indptr, 'indices': np.ascontiguousarray(both[order, 1], dtype='<i4')}
+    return Instance(COLORING, n, m=len(edges), arrays=arrays, name=name)
+
+
+def layout(kind, n, m, flags):
+    """Name, dtype and shape of every array stored for a problem kind, in file order."""
+    if kind == KNAPSACK:
+        fields = [('values', '<i8', (n,))]
+        if flags & HAS_WEIGHTS:
+            fields.append(('weights', '<i8', (n,)))
+        return fields
+    if kind == TSP:
+        return [('xs', '<f8', (n,)), ('ys', '<f8', (n,))]
+    if kind == COLORING:
+        return [('indptr', '<i8', (n + 1,)), ('indices', '<i4', (2 * m,)), ('edges', '<i4', (m, 2))]
+    raise ValueError(f'unknown instance kind {kind}')
+
+
+def aligned(offset):
+    return (offset + 7) & ~7
+
+
+def save(instance, path):
+    flags = HAS_WEIGHTS if 'weights' in instance else 0
+    header = np.zeros(1, dtype=HEADER)
+    header[0] = (MAGIC, VERSION, instance.kind, instance.n, instance.m, instance.target, flags, (0, 0))
+    with open(path, 'wb') as f:
+        f.write(header.tobytes())
+        for name, dtype, shape in layout(instance.kind, instance.n, instance.m, flags):
+            data = np.ascontiguousarray(instance[name], dtype=dtype).reshape(shape)
+            data.tofile(f)
+            f.write(b'\0' * (aligned(data.nbytes) - data.nbytes))
+
+
+def load(path):
+    """Open a binary instance; the arrays are read-only memory maps, so nothing is parsed or copied."""
+    header = np.fromfile(path, dtype=HEADER, count=1)
+    if len(header) != 1 or header['magic'][0] != MAGIC:
+        raise ValueError(f'{path} is not a binary instance file')
+    header = header[0]
+    if header['version'] != VERSION:
+        raise ValueError(f'{path} has unsupported instance version {header["version"]}')
+    kind, n, m, flags = int(header['kind']), int(header['n']), int(header['m']), int(header['flags'])
+    arrays = {}
+    offset = HEADER.itemsize
+    for name, dtype, shape in layout(kind, n, m, flags):
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        arrays[name] = np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape) if size else \
+            np.zeros(shape, dtype=dtype)
+        offset += aligned(size)
+    name = instance_name(path)
+    return Instance(kind, n, m, int(header['target']), arrays, name)
+
+
+def open_text(path, mode='r'):
+    """Open a text instance file, gzip-compressed or not; compression is detected from the content on read."""
+    if 'r' in mode:
+        with open(path, 'rb') as f:
+            compressed = f.read(2) == b'\x1f\x8b'
+    else:
+        compressed = path.endswith('.gz')
+    return gzip.open(path, mode + 't') if compressed else open(path, mode)
+
+
+def parse_chunk(lines, dtype, columns, path):
+    """Parse a block of numeric lines in one NumPy call instead of one Python object per token."""
+    fields = np.fromstring(' '.join(lines), dtype=dtype, sep=' ')
+    if len(fields) != columns * len(lines):
+        raise ValueError(f'{path}: expected {columns} numbers per line in lines {lines[0]!r}..{lines[-1]!r}')
+    return fields.reshape(-1, columns)
+
+
+def read_tsplib(path):
+    # streamed: coordinate lines are parsed chunk_lines at a time into a flat array('d'),
+    # so memory stays at 16 bytes per city plus one chunk of text
+    name, dimension = '', None
+    coords = array('d')
+    with open_text(path) as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            key = key.strip().upper()
+            if key == 'NODE_COORD_SECTION':
+                break
+            if key == 'NAME':
+                name = value.strip()
+            elif key == 'DIMENSION':
+                dimension = int(value)
+            elif key == 'EDGE_WEIGHT_TYPE' and value.strip().upper() not in EUCLIDEAN_TYPES:
+                raise ValueError(f'{path}: unsupported EDGE_WEIGHT_TYPE {value.strip()}')
+        else:
+            raise ValueError(f'{path}: missing NODE_COORD_SECTION')
+        chunk = []
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if not line[0].isdigit():
+                break  # EOF or the next section
+            chunk.append(line)
+            if len(chunk) == chunk_lines:
+                coords.frombytes(parse_chunk(chunk, np.float64, 3, path)[:, 1:].tobytes())
+                chunk = []
+        if chunk:
+            coords.frombytes(parse_chunk(chunk, np.float64, 3, path)[:, 1:].tobytes())
+    xy = np.frombuffer(coords, dtype=np.float64).reshape(-1, 2)
+    if dimension is not None and dimension != len(xy):
+        raise ValueError(f'{path}: DIMENSION is {dimension} but {len(xy)} coordinates were read')
+    return tsp_instance(xy[:, 0], xy[:, 1], name)
+
+
+def write_tsplib(instance, path):
+    with open_text(path, 'w') as f:
+        f.write(f'NAME : {instance.name}\nTYPE : TSP\nDIMENSION : {instance.n}\n'
+                'EDGE_WEIGHT_TYPE : EUC_2D\nNODE_COORD_SECTION\n')
+        for i, (x, y) in enumerate(zip(instance['xs'], instance['ys'])):
+            f.write(f'{i + 1} {float(x)!r} {float(y)!r}\n')
+        f.write('EOF\n')
+
+
+def read_dimacs(path):
+    # streamed like read_tsplib: "e u v" lines are parsed a block at a time into a flat array('i')
+    n = None
+    edges = array('i')
+    with open_text(path) as f:
+        for lines in iter(lambda: f.readlines(chunk_bytes), []):
+            chunk = [line[1:] for line in lines if line.startswith('e')]
+            if chunk:
+                edges.frombytes(parse_chunk(chunk, np.int32, 2, path).tobytes())
+            if n is None and len(chunk) != len(lines):
+                n = next((int(line.split()[2]) for line in lines if line.startswith('p')), None)
+    if n is None:
+        raise ValueError(f'{path}: missing "p edge" line')
+    edges = np.frombuffer(edges, dtype=np.int32).reshape(-1, 2) - 1
+    if len(edges) and (edges.min() < 0 or edges.max() >= n):
+        raise ValueError(f'{path}: edge endpoint outside 1..{n}')
+    # DIMACS files may list an edge in both directions; keep each undirected edge once
+    edges = np.sort(edges[edges[:, 0] != edges[:, 1]], axis=1).astype(np.int64)
+    keys = np.sort(edges[:, 0] * n + edges[:, 1])
+    first = np.ones(len(keys), dtype=bool)
+    first[1:] = keys[1:] != keys[:-1]
+    keys = keys[first]
+    return coloring_instance(n, np.column_stack((keys // n, keys % n)), instance_name(path))
+
+
+def write_dimacs(instance, path):
+    with open_text(path, 'w') as f:
+        f.write(f'c {instance.name}\np edge {instance.n} {instance.m}\n')
+        for u, v in instance['edges']:
+            f.write(f'e {u + 1} {v + 1}\n')
+
+
+def read_knapsack(path):
+    # plain text: a "n target" line, then one "value [weight]" line per item
+    header, values, weights = None, [], []
+    with open_text(path) as f:
+        for line in f:
+            parts = line.split('#', 1)[0].split()
+            if not parts:
+                continue
+            if header is None:
+                header = int(parts[0]), int(parts[1])
+                continue
+            values.append(int(parts[0]))
+            if len(parts) > 1:
+                weights.append(int(parts[1]))
+    if header is None or header[0] != len(values):
+        raise ValueError(f'{path}: item count does not match the header')
+    if weights and len(weights) != len(values):
+        raise ValueError(f'{path}: either every item or no item must have a weight')
+    name = instance_name(path)
+    return knapsack_instance(values, header[1], weights or None, name)
+
+
+def write_knapsack(instance, path):
+    with open_text(path, 'w') as f:
+        f.write(f'{instance.n} {instance.target}\n')
+        if 'weights' in instance:
+            for value, weight in zip(instance['values'], instance['weights']):
+                f.write(f'{value} {weight}\n')
+        else:
+            for value in instance['values']:
+                f.write(f'{value}\n')
+
+
+READERS = {'.tsp': read_tsplib, '.col': read_dimacs, '.kp': read_knapsack, '.inst': load}
+WRITERS = {'.tsp': write_tsplib, '.col': write_dimacs, '.kp': write_knapsack, '.inst': save}
+TEXT_KINDS = {'.tsp': TSP, '.col': COLORING, '.kp': KNAPSACK}
+
+
+def file_type(path):
+    """Instance extension of path and whether it is gzipped, e.g. ('.tsp', True) for a.tsp.gz."""
+    base = os.path.basename(path).lower()
+    compressed = base.endswith('.gz')
+    return os.path.splitext(base[:-3] if compressed else base)[1], compressed
+
+
+def instance_name(path):
+    base = os.path.basename(path)
+    if base.lower().endswith('.gz'):
+        base = base[:-3]
+    return os.path.splitext(base)[0]
+
+
+def check_type(path, table):
+    extension, compressed = file_type(path)
+    if extension not in table:
+        raise ValueError(f'{path}: unknown instance extension, expected one of {", ".join(table)}')
+    if compressed and extension == '.inst':
+        raise ValueError(f'{path}: binary instances are memory-mapped and cannot be gzipped')
+    return extension
+
+
+def read(path):
+    """Read any supported instance file, chosen by extension (text formats may be gzipped)."""
+    return READERS[check_type(path, READERS)](path)
+
+
+def write(instance, path):
+    extension = check_type(path, WRITERS)
+    if TEXT_KINDS.get(extension, instance.kind) != instance.kind:
+        raise ValueError(f'{path}: a {KIND_NAMES[instance.kind]} instance cannot be written as {extension}')
+    WRITERS[extension](instance, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Convert and inspect problem instance files.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    convert = commands.add_parser('convert', help='convert between .inst and .tsp / .col / .kp text files (optionally .gz)')
+    convert.add_argument('source')
+    convert.add_argument('destination')
+    info = commands.add_parser('info', help='print the size of an instance')
+    info.add_argument('path')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'convert':
+            write(read(args.source), args.destination)
+        else:
+            instance = read(args.path)
+            print(f'{instance.name}: {KIND_NAMES[instance.kind]}, n={instance.n}, m={instance.m}, target={instance.target}')
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+
+if __name__ == '__main__':
+    main()
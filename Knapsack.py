@@ -1,8 +1,17 @@
+import heapq
 import math
+import multiprocessing
+from bisect import bisect_right
+import os
 import random
 import tkinter as tk
 from tkinter import *
 import threading
+import time
+
+import numpy as np
+
+import GeneticOperators
 
 num_items = 100
 frac_target = 0.7
@@ -17,9 +26,30 @@ num_generations = 1000
 pop_size = 50
 elitism_count = 2
 mutation_rate = 0.1
+# GA operators by name, from the tables in GeneticOperators
+selection_method = 'random'
+crossover_method = 'single_point'
+mutation_method = 'bit_flip'
 
 sleep_time = 0.1
 
+# rows per block when scoring a population, keeps the float64 temporaries small
+eval_chunk_rows = 1024
+
+# limits for the exact subset-sum solver before it falls back to the next strategy
+max_bitset_cells = 1 << 30
+max_mitm_items = 40
+
+# island model: one worker process per island, exchanging their best genomes every epoch
+num_islands = os.cpu_count() or 1
+migration_interval = 10
+migration_count = 2
+
+# weighted 0/1 knapsack: weights sit within weight_spread of their item's value (a correlated
+# instance), and branch-and-bound stops after bnb_node_budget nodes
+weight_spread = 100
+bnb_node_budget = 10_000_000
+
 
 def random_rgb_color():
     red = random.randint(0x10, 0xff)
@@ -29,14 +59,36 @@ def random_rgb_color():
     return hex_color
 
 
+def generate_items(n, seed=None, low=min_value, high=max_value):
+    # distinct values drawn in bulk, returned as parallel arrays of values and (r, g, b) colors
+    if n > high - low + 1:
+        raise ValueError(f'cannot draw {n} distinct values from [{low}, {high}], widen the bounds')
+    rng = np.random.default_rng(seed)
+    values = low + rng.choice(high - low + 1, n, replace=False)
+    colors = rng.integers(0x10, 0x100, (n, 3))
+    return values, colors
+
+
+def generate_weights(values, seed=None, spread=weight_spread):
+    # correlated weights: each within spread of its value, never below 1
+    rng = np.random.default_rng(seed)
+    values = np.asarray(values, dtype=np.int64)
+    return np.maximum(values + rng.integers(-spread, spread + 1, len(values)), 1)
+
+
 class Item:
-    def __init__(self):
-        self.value = random.randint(min_value, max_value)
-        self.color = random_rgb_color()
+    def __init__(self, value=None, color=None, weight=None):
+        self.value = random.randint(min_value, max_value) if value is None else value
+        self.color = random_rgb_color() if color is None else color
+        # without a weight an item weighs its value, which makes the knapsack a subset-sum problem
+        self.weight = self.value if weight is None else weight
         self.x = 0
         self.y = 0
         self.w = 0
         self.h = 0
+        self.active = False
+        self.rect_id = None
+        self.text_id = None
 
     def place(self, x, y, w, h):
         self.x = x
@@ -45,23 +97,552 @@ class Item:
         self.h = h
 
     def draw(self, canvas, active=False):
-        canvas.create_text(self.x + self.w + item_padding + stroke_width * 2, self.y + self.h / 2, text=f'{self.value}')
-        if active:
-            canvas.create_rectangle(self.x,
-                                    self.y,
-                                    self.x + self.w,
-                                    self.y + self.h,
-                                    fill=self.color,
-                                    outline=self.color,
-                                    width=stroke_width)
+        self.active = active
+        self.text_id = canvas.create_text(self.x + self.w + item_padding + stroke_width * 2, self.y + self.h / 2,
+                                          text=self.label())
+        self.rect_id = canvas.create_rectangle(self.x,
+                                               self.y,
+                                               self.x + self.w,
+                                               self.y + self.h,
+                                               fill=self.color if active else '',
+                                               outline=self.color,
+                                               width=stroke_width)
+
+    def label(self):
+        return f'{self.value}' if self.weight == self.value else f'{self.value} / {self.weight}'
+
+    def set_active(self, canvas, active):
+        # only touch the canvas when the item actually flips
+        if active != self.active:
+            self.active = active
+            canvas.itemconfig(self.rect_id, fill=self.color if active else '')
+
+class Population:
+    def __init__(self, values, target, size=pop_size, rng=None,
+                 selection=selection_method, crossover=crossover_method, mutation=mutation_method):
+        self.values = np.asarray(values, dtype=np.int64)
+        self.target = target
+        self.size = size
+        self.num_items = len(self.values)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.select = GeneticOperators.lookup(GeneticOperators.SELECTIONS, selection)
+        self.cross = GeneticOperators.lookup(GeneticOperators.CROSSOVERS, crossover, GeneticOperators.BINARY)
+        self.mutation = GeneticOperators.lookup(GeneticOperators.MUTATIONS, mutation, GeneticOperators.BINARY)
+        # every genome carries its sum; with single-point crossover and bit flips it also carries
+        # its sums over blocks of block_size genes, so a child's sum is assembled from its parents'
+        # block sums and only the block holding the cut point is summed again
+        self.block_size = max(1, math.isqrt(self.num_items))
+        self.num_blocks = -(-self.num_items // self.block_size)
+        self.padded_values = np.zeros(self.num_blocks * self.block_size, dtype=np.int64)
+        self.padded_values[:self.num_items] = self.values
+        self.genomes = self.rng.random((size, self.num_items)) < frac_target
+        if self.cross is GeneticOperators.single_point_crossover and \
+                self.mutation is GeneticOperators.bit_flip_mutation:
+            self.blocks = self.gene_block_sums(self.genomes)
+            self.sums = self.blocks.sum(axis=1)
+        else:
+            self.blocks = None
+            self.sums = self.gene_sums(self.genomes)
+        self.fitnesses = None
+        self.evaluate()
+
+    def gene_sums(self, genomes):
+        # one matrix-vector product per block of rows; float64 is exact well past any reachable sum
+        weights = self.values.astype(np.float64)
+        sums = np.empty(len(genomes), dtype=np.int64)
+        for start in range(0, len(genomes), eval_chunk_rows):
+            block = genomes[start:start + eval_chunk_rows]
+            sums[start:start + eval_chunk_rows] = np.rint(block.astype(np.float64) @ weights)
+        return sums
+
+    def gene_block_sums(self, genomes):
+        weights = self.padded_values.astype(np.float64).reshape(self.num_blocks, self.block_size)
+        blocks = np.empty((len(genomes), self.num_blocks), dtype=np.int64)
+        for start in range(0, len(genomes), eval_chunk_rows):
+            rows = genomes[start:start + eval_chunk_rows]
+            padded = np.zeros((len(rows), len(self.padded_values)))
+            padded[:, :self.num_items] = rows
+            blocks[start:start + eval_chunk_rows] = np.rint(
+                np.einsum('rbk,bk->rb', padded.reshape(len(rows), self.num_blocks, self.block_size), weights))
+        return blocks
+
+    def evaluate(self):
+        self.fitnesses = np.abs(self.sums - self.target)
+        order = np.argsort(self.fitnesses, kind='stable')
+        self.genomes = self.genomes[order]
+        self.sums = self.sums[order]
+        self.fitnesses = self.fitnesses[order]
+        if self.blocks is not None:
+            self.blocks = self.blocks[order]
+
+    def best(self):
+        return self.genomes[0], int(self.sums[0]), int(self.fitnesses[0])
+
+    def parents(self, num_children):
+        # selections want higher-is-better, non-negative fitness
+        scores = 1.0 / (1.0 + self.fitnesses)
+        first = self.select(scores, num_children, self.rng)
+        second = self.select(scores, num_children, self.rng)
+        # re-pair a parent with itself with a distinct random partner, as with random.sample
+        same = np.flatnonzero(first == second)
+        second[same] = (first[same] + self.rng.integers(1, self.size, len(same))) % self.size
+        return first, second
+
+    def crossover(self, num_children):
+        first, second = self.parents(num_children)
+        return self.cross(self.genomes[first], self.genomes[second], self.rng)
+
+    def mutate(self, children):
+        return self.mutation(children, self.rng, mutation_rate)
+
+    def single_point_children(self, num_children):
+        first, second = self.parents(num_children)
+        points = self.rng.integers(0, self.num_items, num_children)
+        children = GeneticOperators.single_point_crossover(
+            self.genomes[first], self.genomes[second], self.rng, points)
+        # blocks before the cut come from the first parent, blocks after it from the second
+        cut = points // self.block_size
+        blocks = np.where(np.arange(self.num_blocks)[None, :] < cut[:, None], self.blocks[first], self.blocks[second])
+        cols = cut[:, None] * self.block_size + np.arange(self.block_size)
+        rows = np.arange(num_children)
+        # columns past the last item read a clipped gene but a zero padded value
+        genes = children[rows[:, None], np.minimum(cols, self.num_items - 1)]
+        blocks[rows, cut] = (genes * self.padded_values[cols]).sum(axis=1)
+        return children, blocks
+
+    def flip_genes(self, children, blocks):
+        rows, cols = GeneticOperators.bit_flips(len(children), self.num_items, self.rng, mutation_rate)
+        children[rows, cols] ^= True
+        # one flip per row, so each flip just moves its block sum by the item's value
+        blocks[rows, cols // self.block_size] += np.where(children[rows, cols], self.values[cols], -self.values[cols])
+
+    def immigrate(self, genomes):
+        # migrants replace the worst genomes of this population
+        start = len(self.genomes) - len(genomes)
+        self.genomes[start:] = genomes
+        if self.blocks is not None:
+            self.blocks[start:] = self.gene_block_sums(genomes)
+            self.sums[start:] = self.blocks[start:].sum(axis=1)
+        else:
+            self.sums[start:] = self.gene_sums(genomes)
+        self.evaluate()
+
+    def step(self):
+        # elites keep their cached sums; only children are evaluated
+        num_children = self.size - len(self.genomes[:elitism_count])
+        if self.blocks is not None:
+            children, blocks = self.single_point_children(num_children)
+            self.flip_genes(children, blocks)
+            self.blocks = np.concatenate((self.blocks[:elitism_count], blocks))
+            sums = blocks.sum(axis=1)
         else:
-            canvas.create_rectangle(self.x,
-                                    self.y,
-                                    self.x + self.w,
-                                    self.y + self.h,
-                                    fill='',
-                                    outline=self.color,
-                                    width=stroke_width)
+            children = self.mutate(self.crossover(num_children))
+            sums = self.gene_sums(children)
+        self.genomes = np.concatenate((self.genomes[:elitism_count], children))
+        self.sums = np.concatenate((self.sums[:elitism_count], sums))
+        self.evaluate()
+
+
+class KnapsackSolver:
+    def __init__(self, values, target, size=pop_size, rng=None):
+        self.target = target
+        self.population = Population(values, target, size, rng)
+        self.generation = 0
+        self.callbacks = []
+        self.stopped = False
+
+    def subscribe(self, callback):
+        self.callbacks.append(callback)
+
+    def notify(self):
+        for callback in self.callbacks:
+            callback(self)
+
+    def best(self):
+        return self.population.best()
+
+    def solved(self):
+        return self.population.best()[2] == 0
+
+    def stop(self):
+        self.stopped = True
+
+    def step(self):
+        self.population.step()
+        self.generation += 1
+        self.notify()
+
+    def run(self, max_generations=num_generations, time_budget=None):
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        self.notify()
+        while not self.solved() and not self.stopped and self.generation < max_generations:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            self.step()
+        return self.best()
+
+
+def island_worker(connection, values, target, size, seed):
+    population = Population(values, target, size, np.random.default_rng(seed))
+    while True:
+        command = connection.recv()
+        if command is None:
+            break
+        generations, migrants = command
+        if migrants is not None:
+            population.immigrate(migrants)
+        for _ in range(generations):
+            if population.best()[2] == 0:
+                break
+            population.step()
+        best_genome, best_sum, best_fitness = population.best()
+        connection.send((population.genomes[:migration_count].copy(), best_genome.copy(), best_sum, best_fitness))
+    connection.close()
+
+
+class IslandSolver(KnapsackSolver):
+    def __init__(self, values, target, size=pop_size, rng=None, islands=num_islands):
+        self.values = np.asarray(values, dtype=np.int64)
+        self.target = target
+        self.size = size
+        self.islands = islands
+        self.seeds = (rng if rng is not None else np.random.default_rng()).integers(0, 2 ** 32, islands)
+        self.generation = 0
+        self.callbacks = []
+        self.stopped = False
+        self.connections = []
+        self.processes = []
+        self.migrants = [None] * islands
+        self.best_result = (np.zeros(len(self.values), dtype=bool), 0, abs(target))
+
+    def best(self):
+        return self.best_result
+
+    def solved(self):
+        return self.best_result[2] == 0
+
+    def start(self):
+        # spawn rather than fork, the parent may be running a Tk main loop
+        context = multiprocessing.get_context('spawn')
+        for seed in self.seeds:
+            parent, child = context.Pipe()
+            process = context.Process(target=island_worker,
+                                      args=(child, self.values, self.target, self.size, int(seed)), daemon=True)
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+
+    def shutdown(self):
+        for connection in self.connections:
+            connection.send(None)
+            connection.close()
+        for process in self.processes:
+            process.join()
+        self.connections, self.processes = [], []
+
+    def exchange(self, generations):
+        for connection, migrants in zip(self.connections, self.migrants):
+            connection.send((generations, migrants))
+        results = [connection.recv() for connection in self.connections]
+        # ring topology: every island receives the best genomes of its left neighbour
+        self.migrants = [results[i - 1][0] for i in range(self.islands)]
+        for _, genome, total, fitness in results:
+            if fitness < self.best_result[2]:
+                self.best_result = (genome, total, fitness)
+
+    def step(self):
+        self.exchange(migration_interval)
+        self.generation += migration_interval
+        self.notify()
+
+    def run(self, max_generations=num_generations, time_budget=None):
+        self.start()
+        try:
+            self.exchange(0)
+            return super().run(max_generations, time_budget)
+        finally:
+            self.shutdown()
+
+
+class ReachableSums:
+    # Every subset sum of one item set, built once and then queried for any number of targets.
+    # reach[s] says whether s is reachable; first[s] is the item whose pass first reached s, so
+    # s - values[first[s]] was already reachable with earlier items and a witness is a walk of
+    # strictly decreasing item indices. below/above hold the nearest reachable sum on each side.
+    def __init__(self, values):
+        self.values = np.asarray(values, dtype=np.int64)
+        if len(self.values) and self.values.min() <= 0:
+            raise ValueError('reachable sums need positive item values')
+        self.total = int(self.values.sum())
+        cells = len(self.values) * (self.total + 1)
+        if cells > max_bitset_cells:
+            raise ValueError(f'reachable-sum index needs {cells} cells (limit {max_bitset_cells})')
+        index_type = np.int32 if self.total < 2 ** 31 else np.int64
+        self.reach = np.zeros(self.total + 1, dtype=bool)
+        self.reach[0] = True
+        self.first = np.full(self.total + 1, -1, dtype=np.int32)
+        top = 0
+        for i, value in enumerate(self.values.tolist()):
+            # only sums up to the running maximum can be reachable yet
+            new = self.reach[:top + 1] & ~self.reach[value:top + value + 1]
+            self.first[value:top + value + 1][new] = i
+            self.reach[value:top + value + 1] |= new
+            top += value
+        sums = np.arange(self.total + 1, dtype=index_type)
+        self.below = np.maximum.accumulate(np.where(self.reach, sums, 0))
+        self.above = np.minimum.accumulate(np.where(self.reach, sums, self.total)[::-1])[::-1]
+
+    def reachable(self, target):
+        return 0 <= target <= self.total and bool(self.reach[target])
+
+    def nearest(self, target):
+        # closest reachable sum, the lower one on a tie
+        if target <= 0:
+            return 0
+        if target >= self.total:
+            return self.total
+        below, above = int(self.below[target]), int(self.above[target])
+        return below if target - below <= above - target else above
+
+    def witness(self, total):
+        if not self.reachable(total):
+            raise ValueError(f'{total} is not a reachable sum')
+        genome = np.zeros(len(self.values), dtype=bool)
+        while total:
+            i = self.first[total]
+            genome[i] = True
+            total -= int(self.values[i])
+        return genome
+
+
+class SubsetSumSolver:
+    def __init__(self, values, target, size=pop_size, rng=None, index=None):
+        self.values = [int(value) for value in values]
+        self.target = target
+        self.size = size
+        self.rng = rng
+        self.index = index
+        self.genome = np.zeros(len(self.values), dtype=bool)
+        self.generation = 0
+        self.callbacks = []
+        self.strategy = None
+        self.messages = []
+        self.fallback = None
+
+    def subscribe(self, callback):
+        self.callbacks.append(callback)
+
+    def notify(self):
+        for callback in self.callbacks:
+            callback(self)
+
+    def report(self, message):
+        self.messages.append(message)
+        print(message)
+
+    def best(self):
+        if self.fallback is not None:
+            return self.fallback.best()
+        total = sum(value for value, used in zip(self.values, self.genome) if used)
+        return self.genome, total, abs(total - self.target)
+
+    def solved(self):
+        return self.best()[2] == 0
+
+    def stop(self):
+        if self.fallback is not None:
+            self.fallback.stop()
+
+    def solve_bitset(self):
+        # rows[i] holds every sum reachable with the first i items, one bit per sum
+        mask = (1 << (self.target + 1)) - 1
+        reach = 1
+        rows = [reach]
+        for value in self.values:
+            reach |= (reach << value) & mask
+            rows.append(reach)
+            if reach >> self.target & 1:
+                break
+        if not reach >> self.target & 1:
+            return False
+        remaining = self.target
+        for i in range(len(rows) - 2, -1, -1):
+            if not rows[i] >> remaining & 1:
+                self.genome[i] = True
+                remaining -= self.values[i]
+        return True
+
+    def half_sums(self, indices):
+        # every distinct subset sum of the given items that does not exceed the target
+        sums = {0: 0}
+        for bit, i in enumerate(indices):
+            value = self.values[i]
+            for total, subset in list(sums.items()):
+                new_total = total + value
+                if new_total <= self.target and new_total not in sums:
+                    sums[new_total] = subset | (1 << bit)
+        return sums
+
+    def solve_meet_in_the_middle(self):
+        middle = len(self.values) // 2
+        left, right = list(range(middle)), list(range(middle, len(self.values)))
+        left_sums = self.half_sums(left)
+        for total, subset in self.half_sums(right).items():
+            other = left_sums.get(self.target - total)
+            if other is not None:
+                for bit, i in enumerate(left):
+                    self.genome[i] = other >> bit & 1
+                for bit, i in enumerate(right):
+                    self.genome[i] = subset >> bit & 1
+                return True
+        return False
+
+    def run(self, max_generations=num_generations, time_budget=None):
+        if self.target < 0:
+            # item values are positive, so the empty set (sum 0) is already the nearest sum
+            self.strategy = 'trivial'
+            self.report(f'Target {self.target} is negative, no subset of these items can reach it')
+            self.notify()
+            return self.best()
+        cells = len(self.values) * (self.target + 1)
+        if self.index is not None:
+            # a prebuilt index answers directly, with the nearest reachable sum when the target is not
+            self.strategy = 'index'
+            self.genome = self.index.witness(self.index.nearest(self.target))
+            found = self.index.reachable(self.target)
+        elif cells <= max_bitset_cells:
+            self.strategy = 'bitset'
+            found = self.solve_bitset()
+        elif len(self.values) <= max_mitm_items:
+            self.report(f'Bitset DP needs {cells} cells (limit {max_bitset_cells}), switching to meet-in-the-middle')
+            self.strategy = 'meet-in-the-middle'
+            found = self.solve_meet_in_the_middle()
+        else:
+            self.report(f'Bitset DP needs {cells} cells (limit {max_bitset_cells}) and meet-in-the-middle '
+                        f'supports at most {max_mitm_items} items, switching to the genetic algorithm')
+            self.strategy = 'genetic'
+            self.fallback = KnapsackSolver(self.values, self.target, self.size, self.rng)
+            for callback in self.callbacks:
+                self.fallback.subscribe(callback)
+            return self.fallback.run(max_generations, time_budget)
+        if not found:
+            self.report(f'Target {self.target} is not reachable with these items ({self.strategy})')
+            if self.index is not None:
+                self.report(f'Nearest reachable sum is {self.best()[1]}')
+        self.notify()
+        return self.best()
+
+
+class BranchAndBoundSolver:
+    # Weighted 0/1 knapsack: maximise value with total weight <= capacity. Items are sorted by
+    # value/weight and every node is bounded by the Dantzig LP relaxation (fill greedily, then a
+    # fraction of the first item that does not fit). The search dives depth-first, always taking
+    # the next item, and leaves the matching "skip it" node in a heap; when a dive ends it restarts
+    # from the open node with the best bound. Improving incumbents are streamed to subscribers.
+    def __init__(self, values, weights, capacity, node_budget=bnb_node_budget):
+        self.values = np.asarray(values, dtype=np.int64)
+        self.weights = np.asarray(weights, dtype=np.int64)
+        self.capacity = capacity
+        self.target = capacity
+        self.node_budget = node_budget
+        # items heavier than the knapsack can never be packed
+        usable = np.flatnonzero(self.weights <= capacity)
+        ratios = self.values[usable] / self.weights[usable]
+        self.order = usable[np.argsort(-ratios, kind='stable')]
+        self.sorted_values = self.values[self.order].tolist()
+        self.sorted_weights = self.weights[self.order].tolist()
+        self.prefix_values = [0] + np.cumsum(self.values[self.order]).tolist()
+        self.prefix_weights = [0] + np.cumsum(self.weights[self.order]).tolist()
+        self.best_value = 0
+        self.best_taken = None
+        # best bound of any open node, kept current as nodes are popped so streamed gaps are valid
+        self.root_bound = self.bound(0, capacity, 0)[0]
+        self.upper_bound = math.floor(self.root_bound)
+        self.optimal = False
+        self.generation = 0  # nodes explored, under the name the UI shows
+        self.heap = []
+        self.callbacks = []
+        self.stopped = False
+
+    def subscribe(self, callback):
+        self.callbacks.append(callback)
+
+    def notify(self):
+        for callback in self.callbacks:
+            callback(self)
+
+    def stop(self):
+        self.stopped = True
+
+    def genome(self):
+        # the incumbent is kept as a linked list of (start, stop) runs of sorted item positions
+        genome = np.zeros(len(self.values), dtype=bool)
+        taken = self.best_taken
+        while taken is not None:
+            (start, stop), taken = taken
+            genome[self.order[start:stop]] = True
+        return genome
+
+    def best(self):
+        return self.genome(), self.best_value, max(self.upper_bound, self.best_value) - self.best_value
+
+    def used_weight(self, genome):
+        return int(self.weights[genome].sum())
+
+    def solved(self):
+        return self.optimal
+
+    def bound(self, k, cap, value):
+        # Dantzig bound for items k.. with cap left; j is the first item that does not fit
+        fill = self.prefix_weights[k] + cap
+        j = bisect_right(self.prefix_weights, fill) - 1
+        whole = value + self.prefix_values[j] - self.prefix_values[k]
+        if j == len(self.sorted_values):
+            return whole, j
+        return whole + (fill - self.prefix_weights[j]) * self.sorted_values[j] / self.sorted_weights[j], j
+
+    def dive(self, k, cap, value, taken):
+        n = len(self.sorted_values)
+        while True:
+            self.generation += 1
+            bound, j = self.bound(k, cap, value)
+            # values are integers, so a bound below best + 1 cannot improve the incumbent
+            if bound < self.best_value + 1:
+                return
+            greedy = value + self.prefix_values[j] - self.prefix_values[k]
+            if greedy > self.best_value:
+                self.best_value = greedy
+                self.best_taken = ((k, j), taken)
+                self.notify()
+            if j == n:
+                return  # everything left fits: the greedy fill is this subtree's optimum
+            if k < j:
+                heapq.heappush(self.heap, (-bound, self.generation, k + 1, cap, value, taken))
+                cap -= self.sorted_weights[k]
+                value += self.sorted_values[k]
+                taken = ((k, k + 1), taken)
+            k += 1
+
+    def run(self, max_nodes=None, time_budget=None):
+        max_nodes = self.node_budget if max_nodes is None else max_nodes
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        self.notify()
+        self.heap = [(-self.root_bound, 0, 0, self.capacity, 0, None)]
+        while self.heap and not self.stopped and self.generation < max_nodes:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            bound, _, k, cap, value, taken = heapq.heappop(self.heap)
+            if -bound < self.best_value + 1:
+                self.heap = []  # the best open bound cannot improve: the incumbent is optimal
+                break
+            # the popped node has the best bound of all open nodes
+            self.upper_bound = math.floor(-bound)
+            self.dive(k, cap, value, taken)
+        self.optimal = not self.heap
+        self.upper_bound = self.best_value if self.optimal else max(self.best_value, math.floor(-self.heap[0][0]))
+        self.notify()
+        return self.best()
 
 
 class UI(tk.Tk):
@@ -77,6 +658,7 @@ class UI(tk.Tk):
         self.canvas.place(x=0, y=0, width=self.width, height=self.height)
 
         self.items_list = []
+        self.index = None
 
         menu_bar = Menu(self)
         self['menu'] = menu_bar
@@ -94,8 +676,15 @@ class UI(tk.Tk):
 
         def set_target():
             target_set = random.sample(self.items_list, int(num_items * frac_target))
-            self.target = sum(item.value for item in target_set)
+            # in weighted mode the target is the knapsack's capacity
+            if self.solver_mode.get() == 'bnb':
+                self.target = sum(item.weight for item in target_set)
+            else:
+                self.target = sum(item.value for item in target_set)
             self.draw_target()
+            if self.index is not None and self.solver_mode.get() == 'exact':
+                # answered from the item set's index, no solver run needed
+                self.after(0, self.run)
 
         menu_K.add_command(label="Get Target", command=set_target, underline=0)
 
@@ -105,24 +694,32 @@ class UI(tk.Tk):
 
         menu_K.add_command(label="Run", command=start_thread, underline=0)
 
-        self.mainloop()
-
-    def get_rand_item(self):
-        i1 = Item()
-        for i2 in self.items_list:
-            if i1.value == i2.value:
-                return None
-        return i1
+        self.solver_mode = StringVar(value='genetic')
+        menu_S = Menu(menu_bar)
+        menu_bar.add_cascade(menu=menu_S, label='Solver', underline=0)
+        menu_S.add_radiobutton(label="Genetic Algorithm", variable=self.solver_mode, value='genetic', underline=0)
+        menu_S.add_radiobutton(label="Island Model GA", variable=self.solver_mode, value='islands', underline=0)
+        menu_S.add_radiobutton(label="Exact (Subset Sum)", variable=self.solver_mode, value='exact', underline=0)
+        menu_S.add_radiobutton(label="Branch and Bound (Weighted)", variable=self.solver_mode, value='bnb', underline=0)
 
-    def add_item(self):
-        item = self.get_rand_item()
-        while item is None:
-            item = self.get_rand_item()
-        self.items_list.append(item)
+        self.solver = None
+        self.last_draw = 0
+        self.target_ids = None
+        self.sum_ids = None
+        self.generation_id = None
 
     def generate_knapsack(self):
-        for i in range(num_items):
-            self.add_item()
+        values, colors = generate_items(num_items)
+        # weights only matter to branch and bound; the other solvers see a plain subset-sum instance
+        weights = generate_weights(values) if self.solver_mode.get() == 'bnb' else values
+        self.items_list = [Item(int(value), '#{:02x}{:02x}{:02x}'.format(*color), int(weight))
+                           for value, color, weight in zip(values, colors, weights)]
+        # one index per item set: every later target is answered from it without a new search
+        try:
+            self.index = ReachableSums(values)
+        except ValueError as e:
+            print(e)
+            self.index = None
 
         item_max = 0
         item_min = 9999
@@ -150,96 +747,88 @@ class UI(tk.Tk):
 
     def clear_canvas(self):
         self.canvas.delete("all")
+        self.target_ids = None
+        self.sum_ids = None
+        self.generation_id = None
 
     def draw_items(self):
+        self.clear_canvas()
         for item in self.items_list:
             item.draw(self.canvas)
 
-    def draw_target(self):
-        x = (self.width - screen_padding) / 8 * 7
+    def draw_bar(self, ids, x, h, label):
+        # bars and their labels are created once and then moved in place
         y = screen_padding
         w = (self.width - screen_padding) / 8 - screen_padding
+        if ids is None:
+            return (self.canvas.create_rectangle(x, y, x + w, y + h, fill='black'),
+                    self.canvas.create_text(x + w // 2, y + h + screen_padding, text=label, font=('Arial', 18)))
+        self.canvas.coords(ids[0], x, y, x + w, y + h)
+        self.canvas.coords(ids[1], x + w // 2, y + h + screen_padding)
+        self.canvas.itemconfig(ids[1], text=label)
+        return ids
+
+    def draw_target(self):
+        x = (self.width - screen_padding) / 8 * 7
         h = self.height / 2 - screen_padding
-        self.canvas.create_rectangle(x, y, x + w, y + h, fill='black')
-        self.canvas.create_text(x + w // 2, y + h + screen_padding, text=f'{self.target}', font=('Arial', 18))
+        self.target_ids = self.draw_bar(self.target_ids, x, h, f'{self.target}')
 
     def draw_sum(self, item_sum, target):
         x = (self.width - screen_padding) / 8 * 6
-        y = screen_padding
-        w = (self.width - screen_padding) / 8 - screen_padding
         h = self.height / 2 - screen_padding
         h *= (item_sum / target)
-        self.canvas.create_rectangle(x, y, x + w, y + h, fill='black')
-        self.canvas.create_text(x + w // 2, y + h + screen_padding, text=f'{item_sum} ({"+" if item_sum > target else "-"}{abs(item_sum - target)})', font=('Arial', 18))
+        label = f'{item_sum} ({"+" if item_sum > target else "-"}{abs(item_sum - target)})'
+        self.sum_ids = self.draw_bar(self.sum_ids, x, h, label)
 
-    def draw_genome(self, genome, gen_num):
+    def draw_genome(self, genome, text):
         for i in range(num_items):
-            item = self.items_list[i]
-            active = genome[i]
-            item.draw(self.canvas, active)
-        x = (self.width - screen_padding) / 8 * 6
-        y = screen_padding
-        w = (self.width - screen_padding) / 8 - screen_padding
-        h = self.height / 4 * 3
-        self.canvas.create_text(x + w, y + h + screen_padding * 2, text=f'Generation {gen_num}', font=('Arial', 18))
-
-    def run(self):
-        global pop_size
-        global num_generations
-
-        def gene_sum(genome):
-            total = sum(self.items_list[i].value for i in range(len(genome)) if genome[i])
-            return total
-
-        def fitness(genome):
-            return abs(gene_sum(genome) - self.target)
-
-        def get_population(last_pop=None, fitnesses=None):
-            population = []
-            if last_pop is None:
-                for _ in range(pop_size):
-                    genome = [random.random() < frac_target for _ in range(num_items)]
-                    population.append(genome)
-                return population
-            else:
-        
-                elites = [last_pop[i] for i in range(elitism_count)]
-                population.extend(elites)
-
-                while len(population) < pop_size:
-                    parents = random.sample(last_pop, 2)
-                    crossover_point = random.randint(0, num_items - 1)
-                    child = parents[0][:crossover_point] + parents[1][crossover_point:]
-                    if random.random() < mutation_rate:
-                        mutate_index = random.randint(0, num_items - 1)
-                        child[mutate_index] = not child[mutate_index]
-                    population.append(child)
-
-                return population
-
-        def generation_step(generation=0, pop=None):
-            if generation >= num_generations:
-                return
-
-            if pop is None:
-                pop = get_population()
-
-            fitnesses = sorted(pop, key=fitness)
-            best_genome = fitnesses[0]
-            best_fitness = fitness(best_genome)
-
-            self.after(0, self.clear_canvas)
-            self.after(0, self.draw_target)
-            self.after(0, self.draw_sum, gene_sum(best_genome), self.target)
-            self.after(0, self.draw_genome, best_genome, generation)
-
-            if best_fitness == 0:
-                print(f'Target met at generation {generation}!')
-                return  
-            self.after(int(sleep_time * 1000), generation_step, generation + 1, get_population(pop))
+            self.items_list[i].set_active(self.canvas, bool(genome[i]))
+        if self.generation_id is None:
+            x = (self.width - screen_padding) / 8 * 6
+            y = screen_padding
+            w = (self.width - screen_padding) / 8 - screen_padding
+            h = self.height / 4 * 3
+            self.generation_id = self.canvas.create_text(x + w, y + h + screen_padding * 2, text=text, font=('Arial', 18))
+        else:
+            self.canvas.itemconfig(self.generation_id, text=text)
+
+    def draw_progress(self, solver):
+        best_genome, best_sum, best_fitness = solver.best()
+        self.after(0, self.draw_target)
+        if isinstance(solver, BranchAndBoundSolver):
+            # weighted mode: the bar shows the weight packed against the capacity
+            self.after(0, self.draw_sum, solver.used_weight(best_genome), self.target)
+            text = f'Nodes {solver.generation}: value {best_sum} (gap {best_fitness})'
+        else:
+            self.after(0, self.draw_sum, best_sum, self.target)
+            text = f'Generation {solver.generation}'
+        self.after(0, self.draw_genome, best_genome.copy(), text)
 
-        generation_step()
+    def on_progress(self, solver):
+        # the solver is not throttled, so only repaint every sleep_time seconds
+        now = time.perf_counter()
+        if now - self.last_draw >= sleep_time:
+            self.last_draw = now
+            self.draw_progress(solver)
 
+    def run(self):
+        values = [item.value for item in self.items_list]
+        if self.solver_mode.get() == 'exact':
+            self.solver = SubsetSumSolver(values, self.target, index=self.index)
+        elif self.solver_mode.get() == 'bnb':
+            self.solver = BranchAndBoundSolver(values, [item.weight for item in self.items_list], self.target)
+        else:
+            solver_class = IslandSolver if self.solver_mode.get() == 'islands' else KnapsackSolver
+            self.solver = solver_class(values, self.target)
+        self.solver.subscribe(self.on_progress)
+        # branch and bound counts nodes rather than generations and has its own budget
+        self.solver.run(None if isinstance(self.solver, BranchAndBoundSolver) else num_generations)
+        self.draw_progress(self.solver)
+        if isinstance(self.solver, BranchAndBoundSolver):
+            print(f'Best value {self.solver.best_value} ({"optimal" if self.solver.solved() else "budget exhausted"}) '
+                  f'after {self.solver.generation} nodes')
+        elif self.solver.solved():
+            print(f'Target met at generation {self.solver.generation}!')
 
 if __name__ == '__main__':
-    UI()
\ No newline at end of file
+    UI().mainloop()
\ No newline at end of file
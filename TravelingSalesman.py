@@ -1,13 +1,44 @@
 import math
+import multiprocessing
+import os
+import queue
 import random
+import threading
+import time
+from array import array
 import tkinter as tk
-from tkinter import messagebox
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from tkinter import filedialog, messagebox
+
+import numpy as np
+
+import InstanceFile
 
 # Configuration parameters
 num_cities = 25
 city_radius = 10
 road_width = 2
 padding = 50
+frame_interval = 33  # ms between UI refreshes while a solver runs
+draw_limit = 5000  # larger instances are solved without drawing cities or routes
+
+# Sparse mode: past dense_limit cities no distance matrix is built; distances are
+# computed on demand and moves use k-nearest candidate lists
+dense_limit = 2000
+num_neighbors = 10
+
+# Local search: depth of the Lin-Kernighan move chain, and the smallest gain that counts
+lk_depth = 5
+epsilon = 1e-9
+
+# Ant Colony System: the colony is split across a process pool, ants_per_worker ants each
+aco_iterations = 200
+ants_per_worker = 10
+aco_beta = 2.0
+aco_q0 = 0.9  # probability of taking the best candidate instead of sampling
+aco_rho = 0.1  # global pheromone evaporation
+aco_xi = 0.1  # local pheromone evaporation
 
 class Location:
     def __init__(self, x, y, id):
@@ -15,10 +46,11 @@ class Location:
         self.y = y
         self.id = id  # Unique identifier for the city
 
-    def draw(self, canvas, color='blue'):
-        canvas.create_oval(
-            self.x - city_radius, self.y - city_radius,
-            self.x + city_radius, self.y + city_radius,
+    def draw(self, canvas, color='blue', view=None):
+        x, y = view(self.x, self.y) if view else (self.x, self.y)
+        return canvas.create_oval(
+            x - city_radius, y - city_radius,
+            x + city_radius, y + city_radius,
             fill=color, outline='black'
         )
 
@@ -29,28 +61,160 @@ class Path:
         self.end = end
         self.distance = math.hypot(start.x - end.x, start.y - end.y)
 
-    def draw(self, canvas, color='gray', dashed=False):
+    def draw(self, canvas, color='gray', dashed=False, view=None):
         kwargs = {'fill': color, 'width': road_width}
         if dashed:
             kwargs['dash'] = (4, 2)
-        canvas.create_line(
-            self.start.x, self.start.y,
-            self.end.x, self.end.y,
-            **kwargs
-        )
+        start = view(self.start.x, self.start.y) if view else (self.start.x, self.start.y)
+        end = view(self.end.x, self.end.y) if view else (self.end.x, self.end.y)
+        return canvas.create_line(*start, *end, **kwargs)
+
+
+class SpatialGrid:
+    """Uniform bucket grid over the city coordinates for nearest-neighbor queries."""
+
+    def __init__(self, locations, per_cell=2):
+        self.locations = locations
+        xs = [location.x for location in locations]
+        ys = [location.y for location in locations]
+        self.min_x, self.min_y = min(xs), min(ys)
+        area = max(max(xs) - self.min_x, 1) * max(max(ys) - self.min_y, 1)
+        self.cell_size = max(math.sqrt(area * per_cell / len(locations)), 1e-9)
+        self.cols = int((max(xs) - self.min_x) / self.cell_size) + 1
+        self.rows = int((max(ys) - self.min_y) / self.cell_size) + 1
+        self.cells = {}
+        for index, location in enumerate(locations):
+            self.cells.setdefault(self.cell_of(location), []).append(index)
+
+    def cell_of(self, location):
+        return (int((location.x - self.min_x) / self.cell_size),
+                int((location.y - self.min_y) / self.cell_size))
+
+    def ring(self, cx, cy, radius):
+        if radius == 0:
+            yield cx, cy
+            return
+        for dx in range(-radius, radius + 1):
+            yield cx + dx, cy - radius
+            yield cx + dx, cy + radius
+        for dy in range(-radius + 1, radius):
+            yield cx - radius, cy + dy
+            yield cx + radius, cy + dy
+
+    def nearest(self, index, k):
+        location = self.locations[index]
+        cx, cy = self.cell_of(location)
+        found = []
+        max_radius = max(self.cols, self.rows)
+        for radius in range(max_radius + 1):
+            for cell in self.ring(cx, cy, radius):
+                for other in self.cells.get(cell, ()):
+                    if other != index:
+                        target = self.locations[other]
+                        found.append((math.hypot(location.x - target.x, location.y - target.y), other))
+            # every city within radius * cell_size has been seen once this ring is scanned
+            if len(found) >= k:
+                found.sort()
+                if found[k - 1][0] <= radius * self.cell_size:
+                    break
+        found.sort()
+        return [other for _, other in found[:k]]
+
+
+class Tour:
+    """Cyclic tour as an array('i') of cities plus the inverse position index."""
+
+    def __init__(self, order):
+        self.order = array('i', order)
+        self.position = array('i', bytes(4 * len(self.order)))
+        self.update_positions(0, len(self.order))
+
+    def __len__(self):
+        return len(self.order)
+
+    def __getitem__(self, index):
+        return self.order[index]
+
+    def snapshot(self):
+        return array('i', self.order)
+
+    def update_positions(self, start, end):
+        order, position = self.order, self.position
+        for index in range(start, end):
+            position[order[index]] = index
+
+    def succ(self, city):
+        return self.order[(self.position[city] + 1) % len(self.order)]
+
+    def pred(self, city):
+        return self.order[self.position[city] - 1]
+
+    def swap(self, i, j):
+        order = self.order
+        order[i], order[j] = order[j], order[i]
+        self.position[order[i]] = i
+        self.position[order[j]] = j
+
+    def reverse_path(self, first, last):
+        # reverse the path first..last, or the rest of the tour if that is shorter;
+        # both give the same cycle, so a reversal never touches more than n / 2 cities
+        n = len(self.order)
+        order, position = self.order, self.position
+        i, j = position[first], position[last]
+        length = (j - i) % n + 1
+        if 2 * length > n:
+            i, j, length = (j + 1) % n, (i - 1) % n, n - length
+        if i <= j:
+            order[i:j + 1] = order[i:j + 1][::-1]
+            self.update_positions(i, j + 1)
+            return
+        for _ in range(length // 2):
+            a, b = order[i], order[j]
+            order[i], order[j] = b, a
+            position[b], position[a] = i, j
+            i = (i + 1) % n
+            j = (j - 1) % n
+
+    def exchange(self, a, b, c, d):
+        # replace tour edges (a, b) and (c, d) by (a, c) and (b, d)
+        if self.succ(a) == b:
+            self.reverse_path(b, c)
+        else:
+            self.reverse_path(a, d)
+
+    def move_segment(self, i, length, j, reverse=False):
+        # move order[i..i + length - 1] between order[j] and order[j + 1]
+        order = self.order
+        segment = order[i:i + length]
+        if reverse:
+            segment.reverse()
+        if j > i:
+            order[i:j + 1] = order[i + length:j + 1] + segment
+            self.update_positions(i, j + 1)
+        else:
+            order[j + 1:i + length] = segment + order[j + 1:i]
+            self.update_positions(j + 1, i + length)
 
 
 class SalesmanProblemSolver:
-    def __init__(self, locations):
+    def __init__(self, locations, sparse=None):
         self.locations = locations
         self.num_locations = len(locations)
-        self.distance_matrix = self.calculate_distance_matrix()
-        self.current_solution = list(range(self.num_locations))
-        random.shuffle(self.current_solution)
-        self.best_solution = self.current_solution[:]
-        self.best_distance = self.calculate_total_distance(self.best_solution)
+        self.sparse = self.num_locations > dense_limit if sparse is None else sparse
+        self.distance_matrix = None if self.sparse else self.calculate_distance_matrix()
+        self.neighbors = self.calculate_neighbor_lists()
+        order = list(range(self.num_locations))
+        random.shuffle(order)
+        self.tour = Tour(order)
+        self.current_distance = self.calculate_total_distance(self.tour)
+        self.best_distance = self.current_distance
+        # the best tour is only copied when the search is about to leave it
+        self.best_snapshot = None
+        self.best_is_current = True
         self.temperature = 10000
         self.cooling_rate = 0.995
+        self.passes = 0
+        self.moves = 0  # improving moves applied by local_search_pass
 
     def calculate_distance_matrix(self):
         matrix = [[0]*self.num_locations for _ in range(self.num_locations)]
@@ -64,31 +228,155 @@ class SalesmanProblemSolver:
                 matrix[j][i] = dist
         return matrix
 
+    def calculate_neighbor_lists(self):
+        if self.num_locations < 2:
+            return [[] for _ in range(self.num_locations)]
+        grid = SpatialGrid(self.locations)
+        k = min(num_neighbors, self.num_locations - 1)
+        return [grid.nearest(i, k) for i in range(self.num_locations)]
+
     def calculate_total_distance(self, solution):
         distance = 0
         for i in range(len(solution)):
             a = solution[i]
             b = solution[(i + 1) % len(solution)]
-            distance += self.distance_matrix[a][b]
+            distance += self.distance(a, b)
         return distance
 
-    def swap_locations(self, solution):
-        new_solution = solution[:]
-        i, j = random.sample(range(self.num_locations), 2)
-        new_solution[i], new_solution[j] = new_solution[j], new_solution[i]
-        return new_solution
+    def distance(self, a, b):
+        if self.distance_matrix is not None:
+            return self.distance_matrix[a][b]
+        # sparse mode: computed on demand, one hypot is cheaper than any cache lookup around it
+        location_a, location_b = self.locations[a], self.locations[b]
+        return math.hypot(location_a.x - location_b.x, location_a.y - location_b.y)
+
+    @property
+    def current_solution(self):
+        return self.tour.order
+
+    @property
+    def best_solution(self):
+        return self.tour.order if self.best_is_current else self.best_snapshot
+
+    def leave_best(self):
+        if self.best_is_current:
+            self.best_snapshot = self.tour.snapshot()
+            self.best_is_current = False
+
+    def update_best(self):
+        if self.current_distance < self.best_distance:
+            self.best_distance = self.current_distance
+            self.best_snapshot = None
+            self.best_is_current = True
+
+    # Move evaluation: each *_delta returns the change in length of the current
+    # tour in O(1), and the matching apply_* performs the move in place.
+    def swap_delta(self, i, j):
+        tour = self.tour.order
+        n = len(tour)
+        a, b = tour[i], tour[j]
+        prev_a, next_a = tour[i - 1], tour[(i + 1) % n]
+        prev_b, next_b = tour[j - 1], tour[(j + 1) % n]
+        d = self.distance
+        if j == i + 1:
+            return d(prev_a, b) + d(a, next_b) - d(prev_a, a) - d(b, next_b)
+        if i == 0 and j == n - 1:
+            return d(prev_b, a) + d(b, next_a) - d(prev_b, b) - d(a, next_a)
+        return (d(prev_a, b) + d(b, next_a) + d(prev_b, a) + d(a, next_b)
+                - d(prev_a, a) - d(a, next_a) - d(prev_b, b) - d(b, next_b))
+
+    def apply_swap(self, i, j):
+        self.tour.swap(i, j)
+
+    def two_opt_delta(self, i, j):
+        # reverse tour[i + 1..j], replacing edges (i, i+1) and (j, j+1)
+        tour = self.tour.order
+        a, b = tour[i], tour[i + 1]
+        c, e = tour[j], tour[(j + 1) % len(tour)]
+        d = self.distance
+        return d(a, c) + d(b, e) - d(a, b) - d(c, e)
+
+    def apply_two_opt(self, i, j):
+        self.tour.reverse_path(self.tour[i + 1], self.tour[j])
+
+    def or_opt_delta(self, i, length, j, reverse=False):
+        # move tour[i..i + length - 1] between tour[j] and tour[j + 1]
+        tour = self.tour.order
+        n = len(tour)
+        first, last = tour[i], tour[i + length - 1]
+        before, after = tour[i - 1], tour[(i + length) % n]
+        c, e = tour[j], tour[(j + 1) % n]
+        if reverse:
+            first, last = last, first
+        d = self.distance
+        return (d(before, after) + d(c, first) + d(last, e)
+                - d(before, tour[i]) - d(tour[i + length - 1], after) - d(c, e))
+
+    def apply_or_opt(self, i, length, j, reverse=False):
+        self.tour.move_segment(i, length, j, reverse)
+
+    def valid_or_opt(self, i, length, j):
+        n = self.num_locations
+        return i + length <= n and not (i - 1 <= j < i + length or (i == 0 and j == n - 1))
+
+    def random_move(self):
+        n = self.num_locations
+        if n < 3:
+            return None  # every tour of fewer than three cities has the same length
+        if n <= 4:
+            i, j = sorted(random.sample(range(n), 2))
+            return self.swap_delta(i, j), self.apply_swap, (i, j)
+        kind = random.randrange(3)
+        if self.sparse:
+            return self.candidate_move(kind)
+        if kind == 0:
+            i, j = sorted(random.sample(range(n), 2))
+            return self.swap_delta(i, j), self.apply_swap, (i, j)
+        if kind == 1:
+            i, j = sorted(random.sample(range(n), 2))
+            return self.two_opt_delta(i, j), self.apply_two_opt, (i, j)
+        length = random.randint(1, min(3, n - 3))
+        i = random.randint(0, n - length)
+        j = random.randrange(n)
+        while not self.valid_or_opt(i, length, j):
+            j = random.randrange(n)
+        reverse = random.random() < 0.5
+        return self.or_opt_delta(i, length, j, reverse), self.apply_or_opt, (i, length, j, reverse)
+
+    def candidate_move(self, kind):
+        # like random_move, but every move creates an edge from a city to one of its neighbors
+        n = self.num_locations
+        while True:
+            i = random.randrange(n)
+            j = self.tour.position[random.choice(self.neighbors[self.tour[i]])]
+            if kind == 0:
+                i = (i + 1) % n
+                if i != j:
+                    i, j = min(i, j), max(i, j)
+                    return self.swap_delta(i, j), self.apply_swap, (i, j)
+            elif kind == 1:
+                i, j = min(i, j), max(i, j)
+                return self.two_opt_delta(i, j), self.apply_two_opt, (i, j)
+            else:
+                # insert the segment starting at the neighbor right after city i
+                length = random.randint(1, min(3, n - 3))
+                if self.valid_or_opt(j, length, i):
+                    return self.or_opt_delta(j, length, i), self.apply_or_opt, (j, length, i, False)
 
     def anneal(self):
-        new_solution = self.swap_locations(self.current_solution)
-        current_distance = self.calculate_total_distance(self.current_solution)
-        new_distance = self.calculate_total_distance(new_solution)
-        acceptance_prob = self.acceptance_probability(current_distance, new_distance, self.temperature)
+        move = self.random_move()
+        if move is None:
+            self.temperature *= self.cooling_rate
+            return
+        delta, apply_move, args = move
+        new_distance = self.current_distance + delta
+        acceptance_prob = self.acceptance_probability(self.current_distance, new_distance, self.temperature)
         if acceptance_prob > random.random():
-            self.current_solution = new_solution
-            current_distance = new_distance
-            if current_distance < self.best_distance:
-                self.best_distance = current_distance
-                self.best_solution = self.current_solution[:]
+            if delta >= 0:
+                self.leave_best()
+            apply_move(*args)
+            self.current_distance = new_distance
+            self.update_best()
         self.temperature *= self.cooling_rate
 
     def acceptance_probability(self, current_distance, new_distance, temperature):
@@ -97,6 +385,255 @@ class SalesmanProblemSolver:
         else:
             return math.exp((current_distance - new_distance) / temperature)
 
+    # Local search: 2-opt and Or-opt over candidate lists with don't-look bits,
+    # then a Lin-Kernighan style chain of 2-opt moves. Moves are expressed on
+    # cities via Tour.succ/pred, so they work whichever way round the tour is stored.
+    def initial_tour(self):
+        # boustrophedon strips across the plane: a cheap, reasonable starting tour
+        if not self.locations:
+            return
+        strips = int(math.sqrt(self.num_locations / 2)) + 1
+        min_x = min(location.x for location in self.locations)
+        width = (max(location.x for location in self.locations) - min_x) / strips or 1
+
+        def key(city):
+            location = self.locations[city]
+            strip = min(int((location.x - min_x) / width), strips - 1)
+            return strip, location.y if strip % 2 == 0 else -location.y
+
+        self.leave_best()
+        self.tour = Tour(sorted(range(self.num_locations), key=key))
+        self.current_distance = self.calculate_total_distance(self.tour)
+
+    def run_queue(self, improve_city):
+        pending = deque(self.tour.order)
+        queued = [True] * self.num_locations
+        improved = False
+        while pending:
+            city = pending.popleft()
+            queued[city] = False
+            touched = improve_city(city)
+            if touched:
+                improved = True
+                self.moves += 1
+                for other in touched:
+                    if not queued[other]:
+                        queued[other] = True
+                        pending.append(other)
+        return improved
+
+    def two_opt_city(self, a):
+        d = self.distance
+        for forward in (True, False):
+            b = self.tour.succ(a) if forward else self.tour.pred(a)
+            d_ab = d(a, b)
+            for c in self.neighbors[a]:
+                d_ac = d(a, c)
+                if d_ac >= d_ab - epsilon:
+                    break
+                e = self.tour.succ(c) if forward else self.tour.pred(c)
+                if c == b or e == a:
+                    continue
+                delta = d_ac + d(b, e) - d_ab - d(c, e)
+                if delta < -epsilon:
+                    if forward:
+                        self.tour.exchange(a, b, c, e)
+                    else:
+                        self.tour.exchange(b, a, e, c)
+                    self.current_distance += delta
+                    return a, b, c, e
+        return None
+
+    def or_opt_city(self, first):
+        d = self.distance
+        for length in range(1, min(3, self.num_locations - 3) + 1):
+            segment = [first]
+            for _ in range(length - 1):
+                segment.append(self.tour.succ(segment[-1]))
+            last = segment[-1]
+            before, after = self.tour.pred(first), self.tour.succ(last)
+            removed = d(before, first) + d(last, after) - d(before, after)
+            if removed <= epsilon:
+                continue
+            for c in self.neighbors[first]:
+                if c in segment:
+                    continue
+                for x, y in ((c, self.tour.succ(c)), (self.tour.pred(c), c)):
+                    if x in segment or y in segment:
+                        continue
+                    if x == c:
+                        delta = d(x, first) + d(last, y) - d(x, y) - removed
+                    else:
+                        delta = d(x, last) + d(first, y) - d(x, y) - removed
+                    if delta < -epsilon:
+                        # three 2-opt exchanges move the segment between x and y
+                        self.tour.exchange(before, first, x, y)
+                        self.tour.exchange(before, x, after, last)
+                        if x == c:
+                            self.tour.exchange(x, last, first, y)
+                        self.current_distance += delta
+                        return before, after, first, last, x, y
+        return None
+
+    def lin_kernighan_city(self, t1):
+        d = self.distance
+        for t2 in (self.tour.succ(t1), self.tour.pred(t1)):
+            gain = d(t1, t2)
+            applied = []
+            total = best_total = 0
+            best_depth = 0
+            for _ in range(lk_depth):
+                forward = self.tour.succ(t1) == t2
+                best = None
+                for t3 in self.neighbors[t2]:
+                    g1 = gain - d(t2, t3)
+                    if g1 <= epsilon:
+                        break
+                    t4 = self.tour.pred(t3) if forward else self.tour.succ(t3)
+                    if t3 == t1 or t4 == t2:
+                        continue
+                    score = g1 + d(t3, t4)
+                    if best is None or score > best[0]:
+                        best = (score, t3, t4)
+                if best is None:
+                    break
+                gain, t3, t4 = best
+                total += d(t1, t4) + d(t2, t3) - d(t1, t2) - d(t3, t4)
+                self.tour.exchange(t1, t2, t4, t3)
+                applied.append((t1, t2, t4, t3))
+                if total < best_total - epsilon:
+                    best_total, best_depth = total, len(applied)
+                t2 = t4
+            for a, b, c, e in reversed(applied[best_depth:]):
+                self.tour.exchange(a, c, b, e)
+            if best_depth:
+                self.current_distance += best_total
+                touched = [t1]
+                for a, b, c, e in applied[:best_depth]:
+                    touched.extend((b, c, e))
+                return touched
+        return None
+
+    def local_search_pass(self):
+        if self.passes == 0:
+            self.initial_tour()
+        self.passes += 1
+        improved = self.run_queue(self.two_opt_city)
+        improved = self.run_queue(self.or_opt_city) or improved
+        improved = self.run_queue(self.lin_kernighan_city) or improved
+        self.current_distance = self.calculate_total_distance(self.tour)
+        self.update_best()
+        return improved
+
+
+def construct_tours(pheromone, candidates, attraction, xs, ys, num_ants, tau0, seed):
+    """Build num_ants ACS tours side by side; pheromone is a private copy, updated locally as ants move."""
+    rng = np.random.default_rng(seed)
+    n, k = candidates.shape
+    ants = np.arange(num_ants)
+    tours = np.empty((num_ants, n), dtype=np.int32)
+    visited = np.zeros((num_ants, n), dtype=bool)
+    current = rng.integers(0, n, num_ants)
+    tours[:, 0] = current
+    visited[ants, current] = True
+    for step in range(1, n):
+        rows = candidates[current]
+        weights = pheromone[current] * attraction[current] * ~visited[ants[:, None], rows]
+        cumulative = np.cumsum(weights, axis=1)
+        total = cumulative[:, -1]
+        draws = rng.random(num_ants) * total
+        slots = np.where(rng.random(num_ants) < aco_q0, weights.argmax(axis=1),
+                         np.minimum((draws[:, None] >= cumulative).sum(axis=1), k - 1))
+        following = rows[ants, slots]
+        moved = total > 0
+        pheromone[current[moved], slots[moved]] = (1 - aco_xi) * pheromone[current[moved], slots[moved]] + aco_xi * tau0
+        # every candidate visited: fall back to the nearest unvisited city
+        for ant in np.flatnonzero(~moved):
+            gaps = np.hypot(xs - xs[current[ant]], ys - ys[current[ant]])
+            gaps[visited[ant]] = np.inf
+            following[ant] = np.argmin(gaps)
+        visited[ants, following] = True
+        tours[:, step] = following
+        current = following
+    return tours
+
+
+class AntColonySolver:
+    """Ant Colony System over the candidate lists of a SalesmanProblemSolver, with eta = 1 / d."""
+
+    def __init__(self, problem, workers=None, local_search=True):
+        self.problem = problem
+        self.workers = workers or os.cpu_count() or 1
+        self.num_ants = ants_per_worker * self.workers
+        self.local_search = local_search
+        self.iteration = 0
+        self.pool = None
+        n = problem.num_locations
+        self.xs = np.array([location.x for location in problem.locations], dtype=float)
+        self.ys = np.array([location.y for location in problem.locations], dtype=float)
+        self.candidates = np.array(problem.neighbors, dtype=np.int64).reshape(n, -1)
+        # heuristic eta = 1 / d for every candidate edge, read through problem.distance (the distance matrix when dense)
+        gaps = np.array([[problem.distance(a, b) for b in row] for a, row in enumerate(problem.neighbors)])
+        self.attraction = (1.0 / np.maximum(gaps.reshape(n, -1), epsilon)) ** aco_beta
+        problem.initial_tour()
+        # a single city (or all cities on one spot) gives a zero-length tour
+        self.tau0 = 1.0 / max(n * problem.current_distance, epsilon)
+        self.pheromone = np.full(self.candidates.shape, self.tau0)
+
+    def edge_slots(self, a, b):
+        """Candidate slot of each edge (a, b), and whether b is a candidate of a at all."""
+        match = self.candidates[a] == b[:, None]
+        return match.argmax(axis=1), match.any(axis=1)
+
+    def update_edges(self, tour, rate, value):
+        a = np.asarray(tour, dtype=np.int64)
+        b = np.roll(a, -1)
+        for start, end in ((a, b), (b, a)):
+            slots, found = self.edge_slots(start, end)
+            start, slots = start[found], slots[found]
+            self.pheromone[start, slots] = (1 - rate) * self.pheromone[start, slots] + rate * value
+
+    def tour_lengths(self, tours):
+        following = np.roll(tours, -1, axis=1)
+        return np.hypot(self.xs[tours] - self.xs[following], self.ys[tours] - self.ys[following]).sum(axis=1)
+
+    def construct(self):
+        seeds = np.random.randint(0, 2 ** 31, self.workers)
+        args = (self.pheromone, self.candidates, self.attraction, self.xs, self.ys)
+        if self.workers == 1:
+            return construct_tours(self.pheromone.copy(), *args[1:], self.num_ants, self.tau0, seeds[0])
+        if self.pool is None:
+            # spawn rather than fork, the parent may be running a Tk main loop
+            self.pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+        futures = [self.pool.submit(construct_tours, *args, ants_per_worker, self.tau0, seed) for seed in seeds]
+        return np.concatenate([future.result() for future in futures])
+
+    def iterate(self):
+        tours = self.construct()
+        self.iteration += 1
+        for tour in tours:
+            self.update_edges(tour, aco_xi, self.tau0)
+
+        lengths = self.tour_lengths(tours)
+        best = int(np.argmin(lengths))
+        problem = self.problem
+        problem.leave_best()
+        problem.tour = Tour(tours[best].tolist())
+        problem.current_distance = problem.calculate_total_distance(problem.tour)
+        if self.local_search:
+            problem.run_queue(problem.two_opt_city)
+            problem.current_distance = problem.calculate_total_distance(problem.tour)
+        problem.update_best()
+
+        # global update along the best tour so far
+        self.update_edges(problem.best_solution, aco_rho, 1.0 / max(problem.best_distance, epsilon))
+        return problem.best_distance
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
 
 class TravelingSalesmanUI(tk.Tk):
     def __init__(self):
@@ -108,7 +645,13 @@ class TravelingSalesmanUI(tk.Tk):
 
         self.locations_list = []
         self.solver = None
+        self.colony = None
         self.is_running = False
+        self.stop_event = threading.Event()
+        self.snapshots = None
+        self.route_items = []
+        self.view = None  # maps instance coordinates onto the canvas; None for generated cities
+        self.solver_mode = tk.StringVar(value="anneal")
 
         # Menu Bar
         self.menu = tk.Menu(self)
@@ -123,14 +666,21 @@ class TravelingSalesmanUI(tk.Tk):
         file_menu = tk.Menu(self.menu, tearoff=0)
         self.menu.add_cascade(label="File", menu=file_menu)
         file_menu.add_command(label="Generate Locations", command=self.generate)
+        file_menu.add_command(label="Open...", command=self.open_instance)
         file_menu.add_command(label="Start Solving", command=self.start_solver)
         file_menu.add_command(label="Reset", command=self.reset)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.quit)
 
+        solver_menu = tk.Menu(self.menu, tearoff=0)
+        self.menu.add_cascade(label="Solver", menu=solver_menu)
+        solver_menu.add_radiobutton(label="Simulated Annealing", variable=self.solver_mode, value="anneal")
+        solver_menu.add_radiobutton(label="Local Search (2-opt, Or-opt, LK)", variable=self.solver_mode, value="local")
+        solver_menu.add_radiobutton(label="Ant Colony System", variable=self.solver_mode, value="aco")
+
     def generate(self):
-        self.clear_canvas()
-        self.locations_list.clear()
+        self.reset()  # stops a running solver before its cities are replaced
+        self.view = None
         for i in range(num_cities):
             self.add_location(i)
         self.draw_locations()
@@ -141,49 +691,145 @@ class TravelingSalesmanUI(tk.Tk):
         location = Location(x, y, id)
         self.locations_list.append(location)
 
+    def open_instance(self):
+        path = filedialog.askopenfilename(
+            title="Open TSP Instance",
+            filetypes=[("TSP instances", "*.tsp *.tsp.gz *.inst"), ("All files", "*")])
+        if not path:
+            return
+        try:
+            instance = InstanceFile.read(path)
+            if instance.kind != InstanceFile.TSP:
+                raise ValueError(f"{path} is not a TSP instance")
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Open Instance", str(e))
+            return
+        self.reset()
+        xs, ys = instance['xs'].tolist(), instance['ys'].tolist()
+        self.locations_list = [Location(x, y, i) for i, (x, y) in enumerate(zip(xs, ys))]
+        self.view = self.fit_view(xs, ys)
+        self.draw_locations()
+        self.status_label.config(text=f"{instance.name}: {instance.n} cities")
+
+    def fit_view(self, xs, ys):
+        # the solver works in the file's own coordinates so reported lengths are in the instance's units;
+        # only drawing is scaled to the canvas
+        if not xs:
+            return None
+        min_x, min_y = min(xs), min(ys)
+        span = max(max(xs) - min_x, max(ys) - min_y, 1e-9)
+        scale = min(self.winfo_width() - 2 * padding, self.winfo_height() - 2 * padding) / span
+        return lambda x, y: (padding + (x - min_x) * scale, padding + (y - min_y) * scale)
+
     def draw_locations(self):
+        if len(self.locations_list) > draw_limit:
+            return
         for location in self.locations_list:
-            location.draw(self.canvas)
+            location.draw(self.canvas, view=self.view)
 
     def clear_canvas(self):
         self.canvas.delete("all")
+        self.route_items = []
 
     def start_solver(self):
+        if self.is_running:
+            return
         if not self.locations_list:
             self.generate()
-        self.solver = SalesmanProblemSolver(self.locations_list)
+        mode = self.solver_mode.get()
+        # the worker gets its own copy, so generate() and reset() never change a list it is reading
+        self.solver = SalesmanProblemSolver(list(self.locations_list))
+        # with fewer than two cities there is no edge to lay pheromone on
+        self.colony = AntColonySolver(self.solver) if mode == "aco" and self.solver.num_locations >= 2 else None
         self.is_running = True
-        self.run_solver()
+        # the solver runs on a worker thread and hands best-tour snapshots to the UI through a queue
+        self.stop_event = threading.Event()
+        self.snapshots = queue.Queue()
+        worker = threading.Thread(target=self.run_solver, args=(mode, self.stop_event, self.snapshots), daemon=True)
+        worker.start()
+        self.poll_snapshots(self.snapshots)
 
-    def run_solver(self):
-        if self.is_running and self.solver.temperature > 1:
-            self.solver.anneal()
-            self.clear_canvas()
-            self.draw_solution(self.solver.current_solution)
-            self.canvas.update()
-            self.after(10, self.run_solver)  # Increased delay for better user experience
-        else:
-            self.is_running = False
-            self.display_best_distance()
+    def run_solver(self, mode, stop_event, snapshots):
+        solver, colony = self.solver, self.colony
+        last_distance, last_publish = None, 0.0
+
+        def status():
+            if mode == "local":
+                return f"Pass {solver.passes}: Shortest Path Length: {int(solver.best_distance)}"
+            if colony is not None:
+                return f"Iteration {colony.iteration}: Shortest Path Length: {int(solver.best_distance)}"
+            return f"Shortest Path Length: {int(solver.best_distance)}"
+
+        def publish():
+            nonlocal last_distance, last_publish
+            now = time.perf_counter()
+            if solver.best_distance != last_distance and now - last_publish >= frame_interval / 1000:
+                last_distance, last_publish = solver.best_distance, now
+                snapshots.put((array('i', solver.best_solution), status(), False))
 
-    def display_best_distance(self):
-        self.status_label.config(text=f"Shortest Path Length: {int(self.solver.best_distance)}")
+        try:
+            if colony is not None:
+                while not stop_event.is_set() and colony.iteration < aco_iterations:
+                    colony.iterate()
+                    publish()
+            elif mode == "local":
+                while not stop_event.is_set() and solver.local_search_pass():
+                    publish()
+            else:
+                while not stop_event.is_set() and solver.temperature > 1:
+                    solver.anneal()
+                    publish()
+        finally:
+            if colony is not None:
+                colony.close()
+            snapshots.put((array('i', solver.best_solution), status(), True))
+
+    def poll_snapshots(self, snapshots):
+        if snapshots is not self.snapshots:
+            return  # a newer run (or a reset) replaced this one
+        latest = None
+        while True:
+            try:
+                latest = snapshots.get_nowait()
+            except queue.Empty:
+                break
+        if latest is not None:
+            tour, status, done = latest
+            self.draw_solution(tour)
+            self.status_label.config(text=status)
+            if done:
+                self.is_running = False
+                return
+        self.after(frame_interval, self.poll_snapshots, snapshots)
 
     def reset(self):
         self.clear_canvas()
-        self.locations_list.clear()
+        self.locations_list = []
         self.status_label.config(text="Shortest Path Length: --")
         self.is_running = False
+        self.stop_event.set()
+        self.snapshots = None
 
     def draw_solution(self, solution):
-        for i in range(len(solution)):
+        n = len(solution)
+        if n > draw_limit:
+            return
+        if len(self.route_items) != n:
+            # first frame: create one line per tour edge, later frames only move them
+            self.clear_canvas()
+            for i in range(n):
+                path = Path(self.locations_list[solution[i]], self.locations_list[solution[(i + 1) % n]])
+                self.route_items.append(path.draw(self.canvas, color='blue', dashed=True, view=self.view))  # Dotted lines for solution path
+            for location in self.locations_list:
+                location.draw(self.canvas, color='red', view=self.view)  # Cities shown in red
+            return
+        for i, item in enumerate(self.route_items):
             location_a = self.locations_list[solution[i]]
-            location_b = self.locations_list[solution[(i + 1) % len(solution)]]
-            path = Path(location_a, location_b)
-            path.draw(self.canvas, color='blue', dashed=True)  # Dotted lines for solution path
-        for location in self.locations_list:
-            location.draw(self.canvas, color='red')  # Cities shown in red
-
+            location_b = self.locations_list[solution[(i + 1) % n]]
+            if self.view:
+                self.canvas.coords(item, *self.view(location_a.x, location_a.y), *self.view(location_b.x, location_b.y))
+            else:
+                self.canvas.coords(item, location_a.x, location_a.y, location_b.x, location_b.y)
 
 if __name__ == '__main__':
     ui = TravelingSalesmanUI()